@@ -359,6 +359,7 @@ from .read_ituser_employee_uuid import ReadItuserEmployeeUuid
 from .read_ituser_employee_uuid import ReadItuserEmployeeUuidItusers
 from .read_ituser_employee_uuid import ReadItuserEmployeeUuidItusersObjects
 from .read_ituser_employee_uuid import ReadItuserEmployeeUuidItusersObjectsCurrent
+from .read_ituser_employee_uuid import ReadItuserEmployeeUuidItusersObjectsValidities
 from .read_ituser_uuid import ReadItuserUuid
 from .read_ituser_uuid import ReadItuserUuidItusers
 from .read_ituser_uuid import ReadItuserUuidItusersObjects
@@ -639,6 +640,7 @@ __all__ = [
     "ReadItuserEmployeeUuidItusers",
     "ReadItuserEmployeeUuidItusersObjects",
     "ReadItuserEmployeeUuidItusersObjectsCurrent",
+    "ReadItuserEmployeeUuidItusersObjectsValidities",
     "ReadItuserUuid",
     "ReadItuserUuidItusers",
     "ReadItuserUuidItusersObjects",
@@ -1189,11 +1189,14 @@ class GraphQLClient(AsyncBaseClient):
         query = gql(
             """
             query read_ituser_employee_uuid($ituser_uuid: UUID!) {
-              itusers(filter: {uuids: [$ituser_uuid]}) {
+              itusers(filter: {uuids: [$ituser_uuid], from_date: null, to_date: null}) {
                 objects {
                   current {
                     employee_uuid
                   }
+                  validities {
+                    user_key
+                  }
                 }
               }
             }
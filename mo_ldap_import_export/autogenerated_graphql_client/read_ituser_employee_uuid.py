@@ -14,13 +14,19 @@ class ReadItuserEmployeeUuidItusers(BaseModel):
 
 class ReadItuserEmployeeUuidItusersObjects(BaseModel):
     current: Optional["ReadItuserEmployeeUuidItusersObjectsCurrent"]
+    validities: list["ReadItuserEmployeeUuidItusersObjectsValidities"]
 
 
 class ReadItuserEmployeeUuidItusersObjectsCurrent(BaseModel):
     employee_uuid: UUID | None
 
 
+class ReadItuserEmployeeUuidItusersObjectsValidities(BaseModel):
+    user_key: str
+
+
 ReadItuserEmployeeUuid.update_forward_refs()
 ReadItuserEmployeeUuidItusers.update_forward_refs()
 ReadItuserEmployeeUuidItusersObjects.update_forward_refs()
 ReadItuserEmployeeUuidItusersObjectsCurrent.update_forward_refs()
+ReadItuserEmployeeUuidItusersObjectsValidities.update_forward_refs()
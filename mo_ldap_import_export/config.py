@@ -463,6 +463,11 @@ class Settings(BaseSettings):
     ldap_response_timeout: int = Field(
         10, description="Number of seconds to wait for responses (query timeout)."
     )
+    ldap_max_concurrency: int = Field(
+        16,
+        gt=0,
+        description="Maximum number of concurrent operations against the LDAP server.",
+    )
 
     # TODO: Remove this, as it already exists within FastRAMQPI?
     mo_url: AnyHttpUrl = Field(
@@ -470,6 +475,34 @@ class Settings(BaseSettings):
         description="Base URL for OS2mo.",
     )
 
+    mo_lookup_cache_ttl: float = Field(
+        60,
+        description=(
+            "Seconds to cache positive CPR-number and ITUser to employee lookups, "
+            "and IT system and class UUID lookups, against MO. "
+            "Set to 0 to disable caching."
+        ),
+    )
+
+    ldap_healthcheck_cache_ttl: float = Field(
+        5,
+        description=(
+            "Seconds to trust a successful LDAP healthcheck search before searching "
+            "again. Failed searches are never cached. Set to 0 to disable caching."
+        ),
+    )
+
+    ldap_non_employee_cache_ttl: float = Field(
+        0,
+        description=(
+            "Seconds to remember LDAP objects that are not of the employee objectClass, "
+            "so that repeated events for them are ignored without querying LDAP. "
+            "Events for objects changed to the employee objectClass are ignored until "
+            "the entry expires, unless synchronised explicitly via /ldap2mo/uuid. "
+            "Disabled by default."
+        ),
+    )
+
     org_unit_path_string_separator: str = Field(
         "\\", description="separator for full paths to org units in LDAP"
     )
@@ -501,12 +534,12 @@ class Settings(BaseSettings):
     @root_validator
     def combine_discriminator_fields(cls, values: dict[str, Any]) -> dict[str, Any]:
         """Ensure that discriminator fields are combined."""
-        # No discriminator_field, nothing to combine
         discriminator_field = values["discriminator_field"]
-        if discriminator_field is None:
-            return values
-        discriminator_fields = values["discriminator_fields"]
-        discriminator_fields.append(discriminator_field)
+        # If discriminator_fields is not in values, its field validator failed
+        discriminator_fields = values.get("discriminator_fields", [])
+        if discriminator_field is not None:
+            discriminator_fields.append(discriminator_field)
+        # These keys are reserved in the discriminator template context
         for key in ["dn", "value"]:
             if key in discriminator_fields:
                 raise ValueError(f"Invalid field in DISCRIMINATOR_FIELD(S): '{key}'")
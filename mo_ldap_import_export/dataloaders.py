@@ -8,13 +8,11 @@ from uuid import UUID
 
 import structlog
 from more_itertools import one
-from more_itertools import partition
 
 from .config import Settings
 from .exceptions import DNNotFound
 from .exceptions import MultipleObjectsReturnedException
 from .exceptions import NoObjectsReturnedException
-from .ldap import is_uuid
 from .ldapapi import LDAPAPI
 from .moapi import MOAPI
 from .models import ITUser
@@ -71,9 +69,14 @@ class DataLoader:
         """
         Extracts unique ldap uuids from a list of it-users
         """
-        it_user_keys = {ituser.user_key for ituser in it_users}
-        not_uuids, uuids = partition(is_uuid, it_user_keys)
-        not_uuid_set = set(not_uuids)
+        # Parse each user-key once, rather than validating and then converting it
+        uuids: set[UUID] = set()
+        not_uuid_set: set[str] = set()
+        for ituser in it_users:
+            try:
+                uuids.add(UUID(ituser.user_key))
+            except ValueError:
+                not_uuid_set.add(ituser.user_key)
         if not_uuid_set:
             logger.warning("Non UUID IT-user user-keys", user_keys=not_uuid_set)
             raise ExceptionGroup(
@@ -84,7 +87,7 @@ class DataLoader:
                 ],
             )
         # TODO: Check for duplicates?
-        return set(map(UUID, uuids))
+        return uuids
 
     async def find_mo_employee_dn_by_itsystem(self, uuid: UUID) -> set[DN]:
         """Tries to find the LDAP DNs belonging to a MO employee via ITUsers.
@@ -105,6 +108,10 @@ class DataLoader:
 
         it_system_uuid = UUID(raw_it_system_uuid)
         it_users = await self.moapi.load_mo_employee_it_users(uuid, it_system_uuid)
+        # No ITUsers, no problem
+        if not it_users:
+            return set()
+
         ldap_uuids = self.extract_unique_ldap_uuids(it_users)
         dns = await self.ldapapi.convert_ldap_uuids_to_dns(ldap_uuids)
         # No DNs, no problem
@@ -190,13 +197,16 @@ class DataLoader:
 
     # TODO: move to synctool
     async def make_mo_employee_dn(self, uuid: UUID) -> DN:
-        employee = await self.moapi.load_mo_employee(uuid)
+        # The two lookups are independent, so we fetch them concurrently
+        employee, raw_it_system_uuid = await asyncio.gather(
+            self.moapi.load_mo_employee(uuid),
+            self.moapi.get_ldap_it_system_uuid(),
+        )
         if employee is None:
             raise NoObjectsReturnedException(f"Unable to lookup employee: {uuid}")
         cpr_number = CPRNumber(employee.cpr_number) if employee.cpr_number else None
 
         # Check if we even dare create a DN
-        raw_it_system_uuid = await self.moapi.get_ldap_it_system_uuid()
         if raw_it_system_uuid is None and cpr_number is None:
             logger.warning(
                 "Could not or generate a DN for employee (cannot correlate)",
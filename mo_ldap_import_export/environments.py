@@ -1,7 +1,11 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
-import string
+import asyncio
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
 from contextlib import suppress
+from contextvars import ContextVar
 from datetime import datetime
 from functools import partial
 from typing import Any
@@ -10,17 +14,17 @@ from typing import cast
 from uuid import UUID
 
 import structlog
-from fastapi.encoders import jsonable_encoder
 from fastramqpi.ramqp.utils import RequeueMessage
 from jinja2 import Environment
 from jinja2 import StrictUndefined
+from jinja2 import Template
 from jinja2 import TemplateRuntimeError
 from jinja2 import UndefinedError
 from jinja2.utils import missing
+from ldap3 import Connection
 from more_itertools import flatten
 from more_itertools import one
 from more_itertools import only
-from more_itertools import unzip
 from pydantic import parse_obj_as
 
 from mo_ldap_import_export.ldap import get_ldap_object
@@ -70,10 +74,13 @@ def filter_mo_datestring(datetime_object):
     return datetime_object.strftime("%Y-%m-%dT00:00:00")
 
 
+NON_DIGITS_REGEX = re.compile(r"[^0-9]")
+
+
 def filter_strip_non_digits(input_string):
     if not isinstance(input_string, str):
         return None
-    return "".join(c for c in input_string if c in string.digits)
+    return NON_DIGITS_REGEX.sub("", input_string)
 
 
 def filter_remove_curly_brackets(text: str) -> str:
@@ -97,15 +104,9 @@ def bitwise_and(input: int, bitmask: int) -> int:
 
 
 async def _get_facet_class_uuid(
-    graphql_client: GraphQLClient, class_user_key: str, facet_user_key: str
+    moapi: MOAPI, class_user_key: str, facet_user_key: str
 ) -> str:
-    result = await graphql_client.read_class_uuid_by_facet_and_class_user_key(
-        facet_user_key, class_user_key
-    )
-    exception = UUIDNotFoundException(
-        f"class not found, facet_user_key: {facet_user_key} class_user_key: {class_user_key}"
-    )
-    return str(one(result.objects, too_short=exception).uuid)
+    return await moapi.get_class_uuid(facet_user_key, class_user_key)
 
 
 get_employee_address_type_uuid = partial(
@@ -114,14 +115,70 @@ get_employee_address_type_uuid = partial(
 get_visibility_uuid = partial(_get_facet_class_uuid, facet_user_key="visibility")
 
 
-async def get_org_unit_path_string(
-    graphql_client: GraphQLClient, org_unit_path_string_separator: str, uuid: str | UUID
-) -> str:
-    uuid = uuid if isinstance(uuid, UUID) else UUID(uuid)
+# Lookups memoised for the duration of a single conversion, as templates often
+# repeat the same lookups, see memoize_template_lookups
+org_unit_ancestor_names_cache: ContextVar[dict[UUID, list[str]] | None] = ContextVar(
+    "org_unit_ancestor_names_cache", default=None
+)
+primary_engagement_cache: ContextVar[dict[UUID, UUID | None] | None] = ContextVar(
+    "primary_engagement_cache", default=None
+)
+
+
+@contextmanager
+def memoize_template_lookups() -> Iterator[None]:
+    """Memoise org-unit ancestor and primary engagement lookups within the context.
+
+    The memoisation is scoped to the context, rather than kept across conversions,
+    so that changes in MO are never rendered from stale lookups. For the same
+    reason it must not span writes to MO, such as an LDAP to MO import creating
+    the engagement that later templates look up.
+    """
+    ancestor_names_token = org_unit_ancestor_names_cache.set({})
+    primary_engagement_token = primary_engagement_cache.set({})
+    try:
+        yield
+    finally:
+        primary_engagement_cache.reset(primary_engagement_token)
+        org_unit_ancestor_names_cache.reset(ancestor_names_token)
+
+
+async def get_primary_engagement_uuid(
+    graphql_client: GraphQLClient, employee_uuid: UUID
+) -> UUID | None:
+    cache = primary_engagement_cache.get()
+    if cache is not None and employee_uuid in cache:
+        return cache[employee_uuid]
+
+    primary_engagement_uuid = await get_primary_engagement(
+        graphql_client, EmployeeUUID(employee_uuid)
+    )
+    if cache is not None:
+        cache[employee_uuid] = primary_engagement_uuid
+    return primary_engagement_uuid
+
+
+async def get_org_unit_ancestor_names(
+    graphql_client: GraphQLClient, uuid: UUID
+) -> list[str]:
+    cache = org_unit_ancestor_names_cache.get()
+    if cache is not None and uuid in cache:
+        return cache[uuid]
+
     result = await graphql_client.read_org_unit_ancestor_names(uuid)
     current = one(result.objects).current
     assert current is not None
     names = [x.name for x in reversed(current.ancestors)] + [current.name]
+    if cache is not None:
+        cache[uuid] = names
+    return names
+
+
+async def get_org_unit_path_string(
+    graphql_client: GraphQLClient, org_unit_path_string_separator: str, uuid: str | UUID
+) -> str:
+    uuid = uuid if isinstance(uuid, UUID) else UUID(uuid)
+    names = await get_org_unit_ancestor_names(graphql_client, uuid)
     assert org_unit_path_string_separator not in names
     return org_unit_path_string_separator.join(names)
 
@@ -165,10 +222,7 @@ async def get_org_unit_name_for_parent(
         If the layer provided is beyond the depth available None is returned.
     """
     uuid = uuid if isinstance(uuid, UUID) else UUID(uuid)
-    result = await graphql_client.read_org_unit_ancestor_names(uuid)
-    current = one(result.objects).current
-    assert current is not None
-    names = [x.name for x in reversed(current.ancestors)] + [current.name]
+    names = await get_org_unit_ancestor_names(graphql_client, uuid)
     with suppress(IndexError):
         return names[layer]
     return None
@@ -227,7 +281,7 @@ async def _get_or_create_facet_class(
         class_user_key = default
     try:
         return await _get_facet_class_uuid(
-            moapi.graphql_client,
+            moapi,
             class_user_key=class_user_key,
             facet_user_key=facet_user_key,
         )
@@ -248,8 +302,8 @@ get_or_create_job_function_uuid = partial(
 async def load_primary_engagement(
     moapi: MOAPI, employee_uuid: UUID
 ) -> Engagement | None:
-    primary_engagement_uuid = await get_primary_engagement(
-        moapi.graphql_client, EmployeeUUID(employee_uuid)
+    primary_engagement_uuid = await get_primary_engagement_uuid(
+        moapi.graphql_client, employee_uuid
     )
     if primary_engagement_uuid is None:
         logger.info(
@@ -263,7 +317,7 @@ async def load_primary_engagement(
     if fetched_engagement is None:  # pragma: no cover
         logger.error("Unable to load mo engagement", uuid=primary_engagement_uuid)
         raise RequeueMessage("Unable to load mo engagement")
-    delete = get_delete_flag(jsonable_encoder(fetched_engagement))
+    delete = get_delete_flag(fetched_engagement)
     if delete:
         logger.debug("Primary engagement is terminated", uuid=primary_engagement_uuid)
         return None
@@ -304,7 +358,7 @@ async def load_it_user(
     if fetched_ituser is None:  # pragma: no cover
         logger.error("Unable to load it-user", uuid=validity.uuid)
         raise RequeueMessage("Unable to load it-user")
-    delete = get_delete_flag(jsonable_encoder(fetched_ituser))
+    delete = get_delete_flag(fetched_ituser)
     if delete:
         logger.debug("IT-user is terminated", uuid=validity.uuid)
         return None
@@ -361,7 +415,7 @@ async def load_address(
     if fetched_address is None:  # pragma: no cover
         logger.error("Unable to load employee address", uuid=validity.uuid)
         raise RequeueMessage("Unable to load employee address")
-    delete = get_delete_flag(jsonable_encoder(fetched_address))
+    delete = get_delete_flag(fetched_address)
     if delete:
         logger.debug("Employee address is terminated", uuid=validity.uuid)
         return None
@@ -371,8 +425,8 @@ async def load_address(
 async def load_org_unit_address(
     moapi: MOAPI, employee_uuid: UUID, address_type_user_key: str
 ) -> Address | None:
-    primary_engagement_uuid = await get_primary_engagement(
-        moapi.graphql_client, EmployeeUUID(employee_uuid)
+    primary_engagement_uuid = await get_primary_engagement_uuid(
+        moapi.graphql_client, employee_uuid
     )
     if primary_engagement_uuid is None:
         logger.info(
@@ -406,7 +460,7 @@ async def load_org_unit_address(
     if fetched_address is None:  # pragma: no cover
         logger.error("Unable to load org-unit address", uuid=validity.uuid)
         raise RequeueMessage("Unable to load org-unit address")
-    delete = get_delete_flag(jsonable_encoder(fetched_address))
+    delete = get_delete_flag(fetched_address)
     if delete:
         logger.debug("Org-unit address is terminated", uuid=validity.uuid)
         return None
@@ -423,23 +477,27 @@ async def generate_username(
     return cast(str, await dataloader.username_generator.generate_username(employee))
 
 
-async def generate_common_name(
-    dataloader: DataLoader,
-    employee_uuid: UUID,
-    dn: DN,
-) -> str:
-    # Fetch the current common name (if any)
-    ldap_connection = dataloader.ldapapi.ldap_connection
-    current_common_name = None
+async def _get_current_common_name(ldap_connection: Connection, dn: DN) -> str | None:
     with suppress(NoObjectsReturnedException):
-        ldap_object = await get_ldap_object(ldap_connection, dn, ["cn"])
+        ldap_object = await get_ldap_object(ldap_connection, dn, ["cn"], nest=False)
         ldap_common_name = getattr(ldap_object, "cn", None)
         if ldap_common_name is not None:
             # This is a list on OpenLDAP, but not on AD
             # We use ensure_list to ensure that AD is handled like Standard LDAP
-            current_common_name = one(ensure_list(ldap_common_name))
+            return cast(str, one(ensure_list(ldap_common_name)))
+    return None
 
-    employee = await dataloader.moapi.load_mo_employee(employee_uuid)
+
+async def generate_common_name(
+    dataloader: DataLoader,
+    employee_uuid: UUID,
+    dn: DN,
+) -> str:
+    # Fetch the current common name (if any) alongside the employee
+    current_common_name, employee = await asyncio.gather(
+        _get_current_common_name(dataloader.ldapapi.ldap_connection, dn),
+        dataloader.moapi.load_mo_employee(employee_uuid),
+    )
     if employee is None:  # pragma: no cover
         raise NoObjectsReturnedException(f"Unable to lookup employee: {employee_uuid}")
     return cast(
@@ -477,6 +535,10 @@ async def get_engagement_uuid(
     return obj.uuid if obj else None
 
 
+MO_TZ_MIN = datetime.min.replace(tzinfo=MO_TZ)
+MO_TZ_MAX = datetime.max.replace(tzinfo=MO_TZ)
+
+
 async def get_employment_interval(
     graphql_client: GraphQLClient, employee_uuid: UUID
 ) -> tuple[datetime | None, datetime | None]:
@@ -484,16 +546,16 @@ async def get_employment_interval(
     if not result.objects:
         return None, None
 
-    tzmin = datetime.min.replace(tzinfo=MO_TZ)
-    tzmax = datetime.max.replace(tzinfo=MO_TZ)
-
-    start_dates, end_dates = unzip(
-        (validity.validity.from_ or tzmin, validity.validity.to or tzmax)
-        for engagement in result.objects
-        for validity in engagement.validities
-    )
-    startdate = min(start_dates)
-    enddate = max(end_dates)
+    # Single pass over the validities, rather than buffering both columns
+    startdate: datetime | None = None
+    enddate: datetime | None = None
+    for engagement in result.objects:
+        for validity in engagement.validities:
+            from_ = validity.validity.from_ or MO_TZ_MIN
+            to = validity.validity.to or MO_TZ_MAX
+            startdate = from_ if startdate is None else min(startdate, from_)
+            enddate = to if enddate is None else max(enddate, to)
+    # Engagements without validities are treated as no engagements at all
     return startdate, enddate
 
 
@@ -511,10 +573,10 @@ def construct_globals_dict(
     return {
         "now": datetime.utcnow,  # TODO: timezone-aware datetime
         "get_employee_address_type_uuid": partial(
-            get_employee_address_type_uuid, graphql_client
+            get_employee_address_type_uuid, moapi
         ),
         "get_it_system_uuid": partial(moapi.get_it_system_uuid),
-        "get_visibility_uuid": partial(get_visibility_uuid, graphql_client),
+        "get_visibility_uuid": partial(get_visibility_uuid, moapi),
         "get_org_unit_path_string": partial(
             get_org_unit_path_string,
             graphql_client,
@@ -561,12 +623,42 @@ class NeverUndefined(StrictUndefined):
         ) from exc
 
 
-def construct_environment(settings: Settings, dataloader: DataLoader) -> Environment:
+class TemplateEnvironment(Environment):
+    """Jinja environment which reuses templates compiled from strings.
+
+    Jinja only caches templates loaded through a loader, not those created using
+    `from_string`, so without this every render would recompile the template.
+    The compiled templates live as long as the environment itself.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.compiled_templates: dict[str, Template] = {}
+
+    def compile_template(self, template_string: str) -> Template:
+        """Compile a template string, reusing the result for repeated compilations.
+
+        Args:
+            template_string: The template source to compile.
+
+        Returns:
+            The compiled template.
+        """
+        template = self.compiled_templates.get(template_string)
+        if template is None:
+            template = self.from_string(template_string)
+            self.compiled_templates[template_string] = template
+        return template
+
+
+def construct_environment(
+    settings: Settings, dataloader: DataLoader
+) -> TemplateEnvironment:
     # We intentionally use 'StrictUndefined' here so undefined accesses yield exceptions
     # instead of silently coercing to falsy values as is the case with 'Undefined'
     # See: https://jinja.palletsprojects.com/en/3.1.x/api/#undefined-types
     # For more details.
-    environment = Environment(undefined=NeverUndefined, enable_async=True)
+    environment = TemplateEnvironment(undefined=NeverUndefined, enable_async=True)
 
     environment.filters["bitwise_and"] = bitwise_and
     environment.filters["mo_datestring"] = filter_mo_datestring
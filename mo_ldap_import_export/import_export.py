@@ -33,12 +33,15 @@ from .customer_specific_checks import ExportChecks
 from .customer_specific_checks import ImportChecks
 from .dataloaders import DN
 from .dataloaders import DataLoader
+from .environments import get_primary_engagement_uuid
+from .environments import memoize_template_lookups
 from .exceptions import DNNotFound
 from .exceptions import SkipObject
 from .ldap import apply_discriminator
+from .ldap import filter_ldap_object
 from .ldap import get_ldap_object
+from .ldap_classes import LdapObject
 from .moapi import Verb
-from .moapi import get_primary_engagement
 from .models import Address
 from .models import Employee
 from .models import Engagement
@@ -176,7 +179,7 @@ class SyncTool:
 
         mo2ldap_template = self.settings.conversion_mapping.mo2ldap
         assert mo2ldap_template is not None
-        template = self.converter.environment.from_string(mo2ldap_template)
+        template = self.converter.environment.compile_template(mo2ldap_template)
         result = await template.render_async({"uuid": uuid, "dn": dn})
         parsed = json.loads(result)
         assert isinstance(parsed, dict)
@@ -234,7 +237,7 @@ class SyncTool:
             logger.debug("create_user_trees not configured, allowing create")
             return True
 
-        primary_engagement_uuid = await get_primary_engagement(
+        primary_engagement_uuid = await get_primary_engagement_uuid(
             self.dataloader.moapi.graphql_client, uuid
         )
         if primary_engagement_uuid is None:
@@ -276,8 +279,12 @@ class SyncTool:
             exit_stack: The injected exit-stack.
         """
         exit_stack.enter_context(bound_contextvars(uuid=str(uuid)))
+        exit_stack.enter_context(memoize_template_lookups())
         logger.info("Registered change in an employee")
 
+        # The employee may have changed CPR number or ITUsers
+        self.dataloader.moapi.evict_employee_lookups(uuid)
+
         if uuid in self.settings.mo_uuids_to_ignore:  # pragma: no cover
             logger.warning("MO event ignored due to ignore-list")
             return {}
@@ -671,30 +678,58 @@ class SyncTool:
             if await self.perform_import_checks(dn, json_key)
         }
         logger.info("Import checks executed", json_keys=json_keys)
+        if not json_keys:
+            return
+
+        # Read the LDAP account once with the attributes required by all the entities
+        # we are about to import, instead of reading the same DN once per entity.
+        ldap_attributes = {
+            attribute
+            for json_key in json_keys
+            for attribute in self.converter.get_ldap_attributes(json_key)
+        }
+        logger.info("Loading object", dn=dn, attributes=ldap_attributes)
+        ldap_object = await get_ldap_object(
+            self.ldap_connection, dn, list(ldap_attributes)
+        )
 
         # First import the Employee, then Engagement if present, then the rest.
         # We want this order so dependencies exist before their dependent objects
         if "Employee" in json_keys:
-            await self.import_single_user_entity("Employee", dn, employee_uuid)
+            await self.import_single_user_entity(
+                "Employee", dn, employee_uuid, ldap_object
+            )
             json_keys.discard("Employee")
 
         if "Engagement" in json_keys:
-            await self.import_single_user_entity("Engagement", dn, employee_uuid)
+            await self.import_single_user_entity(
+                "Engagement", dn, employee_uuid, ldap_object
+            )
             json_keys.discard("Engagement")
 
         await asyncio.gather(
             *[
-                self.import_single_user_entity(json_key, dn, employee_uuid)
+                self.import_single_user_entity(json_key, dn, employee_uuid, ldap_object)
                 for json_key in json_keys
             ]
         )
 
     async def import_single_user_entity(
-        self, json_key: str, dn: str, employee_uuid: UUID
+        self,
+        json_key: str,
+        dn: str,
+        employee_uuid: UUID,
+        ldap_object: LdapObject | None = None,
     ) -> None:
-        logger.info("Loading object", dn=dn, json_key=json_key)
-        loaded_object = await get_ldap_object(
-            self.ldap_connection, dn, self.converter.get_ldap_attributes(json_key)
+        ldap_attributes = self.converter.get_ldap_attributes(json_key)
+        if ldap_object is None:
+            logger.info("Loading object", dn=dn, json_key=json_key)
+            ldap_object = await get_ldap_object(
+                self.ldap_connection, dn, ldap_attributes
+            )
+        # Only expose the attributes mapped for this entity to its templates
+        loaded_object = filter_ldap_object(
+            ldap_object, ldap_attributes, self.ldap_connection.server.schema
         )
         logger.info(
             "Loaded object",
@@ -4,12 +4,15 @@
 
 import asyncio
 import signal
-from collections import ChainMap
-from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager
+from contextlib import nullcontext
+from functools import lru_cache
 from ssl import CERT_NONE
 from ssl import CERT_REQUIRED
+from time import monotonic
 from typing import Any
-from uuid import UUID
+from weakref import WeakKeyDictionary
 
 import ldap3.core.exceptions
 import structlog
@@ -29,8 +32,10 @@ from ldap3 import Tls
 from ldap3 import set_config_parameter
 from ldap3.core.exceptions import LDAPInvalidDnError
 from ldap3.core.exceptions import LDAPNoSuchObjectResult
+from ldap3.protocol.rfc4512 import SchemaInfo
 from ldap3.utils.dn import parse_dn
 from ldap3.utils.dn import safe_dn
+from more_itertools import flatten
 from more_itertools import one
 from more_itertools import only
 
@@ -50,6 +55,43 @@ from .utils import is_list
 logger = structlog.stdlib.get_logger()
 
 
+class LDAPConnectionState:
+    """State kept alongside an LDAP connection for as long as it is open.
+
+    Args:
+        max_concurrency: Maximum number of in-flight operations on the connection.
+        healthcheck_cache_ttl: Seconds to trust a successful healthcheck search.
+    """
+
+    def __init__(self, max_concurrency: int, healthcheck_cache_ttl: float) -> None:
+        # Limits the number of in-flight operations, see ldap_concurrency_limit
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        # Threads waiting for responses, see wait_for_message_id
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="ldap"
+        )
+        # Time and result of the latest healthcheck search, see ldap_healthcheck
+        self.healthcheck_cache_ttl = healthcheck_cache_ttl
+        self.last_healthcheck: tuple[float, bool] | None = None
+
+    def healthcheck_passed_recently(self) -> bool:
+        """Whether the latest healthcheck search succeeded within the TTL."""
+        if self.last_healthcheck is None:
+            return False
+        checked_at, result = self.last_healthcheck
+        return result and monotonic() - checked_at < self.healthcheck_cache_ttl
+
+    def close(self) -> None:
+        """Shut down the threads waiting for responses."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Set up by configure_ldap_connection, and closed by the application lifespan
+ldap_connection_states: WeakKeyDictionary[Connection, LDAPConnectionState] = (
+    WeakKeyDictionary()
+)
+
+
 def construct_server(server_config: ServerConfig) -> Server:
     """Construct an LDAP3 server from settings.
 
@@ -165,6 +207,9 @@ def configure_ldap_connection(settings: Settings) -> Connection:
         # Turn off the alarm
         signal.alarm(0)
 
+    ldap_connection_states[connection] = LDAPConnectionState(
+        settings.ldap_max_concurrency, settings.ldap_healthcheck_cache_ttl
+    )
     return connection
 
 
@@ -188,6 +233,27 @@ async def ldap_healthcheck(context: dict | Context) -> bool:
     if ldap_connection.closed is True:
         logger.warning("LDAP connection not open")
         return False
+    # Probes run every few seconds, so a recent successful search is trusted
+    state = ldap_connection_states.get(ldap_connection)
+    if state is not None and state.healthcheck_passed_recently():
+        logger.debug("LDAP healthcheck passed (cached)")
+        return True
+    checked_at = monotonic()
+    passed = await ldap_healthcheck_search(ldap_connection)
+    if state is not None:
+        state.last_healthcheck = (checked_at, passed)
+    return passed
+
+
+async def ldap_healthcheck_search(ldap_connection: Connection) -> bool:
+    """Check that the LDAP connection can search.
+
+    Args:
+        ldap_connection: The LDAP connection to search with.
+
+    Returns:
+        Whether the search succeeded.
+    """
     try:
         # Try to do a 'SELECT 1' like query, selecting the empty DN
         response, result = await ldap_search(
@@ -222,48 +288,93 @@ async def ldap_healthcheck(context: dict | Context) -> bool:
 async def wait_for_message_id(
     ldap_connection: Connection, message_id: int
 ) -> tuple[Any, Any]:
+    # Each in-flight operation blocks a thread while waiting, so we use a dedicated
+    # executor sized to the concurrency limit, rather than competing for the small
+    # default executor shared with the rest of the application.
+    state = ldap_connection_states.get(ldap_connection)
+    executor = state.executor if state is not None else None
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, ldap_connection.get_response, message_id)
+    return await loop.run_in_executor(
+        executor, ldap_connection.get_response, message_id
+    )
+
+
+def ldap_concurrency_limit(
+    ldap_connection: Connection,
+) -> AbstractAsyncContextManager[Any]:
+    """Limit the number of concurrent operations against the LDAP server.
+
+    Bulk operations fan out using `asyncio.gather`, which without a limit could send
+    hundreds of concurrent operations to the LDAP server, causing it to throttle us.
+
+    Args:
+        ldap_connection: The connection to limit concurrent operations on.
+
+    Returns:
+        Async context manager to hold while the operation is in-flight.
+    """
+    state = ldap_connection_states.get(ldap_connection)
+    if state is None:
+        return nullcontext()
+    return state.semaphore
 
 
 async def ldap_modify(
     ldap_connection: Connection, dn: DN, changes: dict
 ) -> tuple[dict, dict]:
-    message_id = ldap_connection.modify(dn, changes)
-    response, result = await wait_for_message_id(ldap_connection, message_id)
+    async with ldap_concurrency_limit(ldap_connection):
+        message_id = ldap_connection.modify(dn, changes)
+        response, result = await wait_for_message_id(ldap_connection, message_id)
     return response, result
 
 
 async def ldap_modify_dn(
     ldap_connection: Connection, dn: DN, relative_dn: RDN
 ) -> tuple[dict, dict]:
-    message_id = ldap_connection.modify_dn(dn, relative_dn)
-    response, result = await wait_for_message_id(ldap_connection, message_id)
+    async with ldap_concurrency_limit(ldap_connection):
+        message_id = ldap_connection.modify_dn(dn, relative_dn)
+        response, result = await wait_for_message_id(ldap_connection, message_id)
     return response, result
 
 
 async def ldap_add(
     ldap_connection: Connection, dn: DN, object_class, attributes=None
 ) -> tuple[dict, dict]:
-    message_id = ldap_connection.add(dn, object_class, attributes)
-    response, result = await wait_for_message_id(ldap_connection, message_id)
+    async with ldap_concurrency_limit(ldap_connection):
+        message_id = ldap_connection.add(dn, object_class, attributes)
+        response, result = await wait_for_message_id(ldap_connection, message_id)
     return response, result
 
 
 async def ldap_delete(ldap_connection: Connection, dn: DN) -> tuple[dict, dict]:
-    message_id = ldap_connection.delete(dn)
-    response, result = await wait_for_message_id(ldap_connection, message_id)
+    async with ldap_concurrency_limit(ldap_connection):
+        message_id = ldap_connection.delete(dn)
+        response, result = await wait_for_message_id(ldap_connection, message_id)
     return response, result
 
 
 async def ldap_search(
     ldap_connection: Connection, **kwargs
 ) -> tuple[list[dict[str, Any]], dict]:
-    message_id = ldap_connection.search(**kwargs)
-    response, result = await wait_for_message_id(ldap_connection, message_id)
+    async with ldap_concurrency_limit(ldap_connection):
+        message_id = ldap_connection.search(**kwargs)
+        response, result = await wait_for_message_id(ldap_connection, message_id)
     return response, result
 
 
+@lru_cache(maxsize=256)
+def compile_discriminator_template(discriminator: str) -> Template:
+    """Compile a discriminator template, reusing it across invocations.
+
+    Args:
+        discriminator: Jinja template source to compile.
+
+    Returns:
+        The compiled template.
+    """
+    return Template(discriminator)
+
+
 async def apply_discriminator(
     settings: Settings, ldap_connection: Connection, dns: set[DN]
 ) -> DN | None:
@@ -306,7 +417,9 @@ async def apply_discriminator(
     try:
         ldap_objects = await asyncio.gather(
             *[
-                get_ldap_object(ldap_connection, dn, attributes=discriminator_fields)
+                get_ldap_object(
+                    ldap_connection, dn, attributes=discriminator_fields, nest=False
+                )
                 for dn in dns
             ]
         )
@@ -346,16 +459,24 @@ async def apply_discriminator(
         assert isinstance(unpacked_value, str)
         return unpacked_value
 
-    mapping = {
-        ldap_object.dn: {
+    def ldapobject2context(ldap_object: LdapObject) -> dict[str, str | None]:
+        field_mapping = {
             discriminator_field: ldapobject2discriminator(
                 ldap_object, discriminator_field
             )
             for discriminator_field in discriminator_fields
         }
-        for ldap_object in ldap_objects
+        value = None
+        if len(field_mapping) == 1:
+            value = one(field_mapping.values())
+        return {**field_mapping, "dn": ldap_object.dn, "value": value}
+
+    # Build the template context for each DN in a single pass over the LDAP objects,
+    # rather than recomputing it for each discriminator template evaluated below.
+    contexts = {
+        ldap_object.dn: ldapobject2context(ldap_object) for ldap_object in ldap_objects
     }
-    assert dns == set(mapping.keys())
+    assert dns == set(contexts.keys())
 
     discriminator_values = settings.discriminator_values
     # If the discriminator_function is exclude, discriminator_values will be a
@@ -381,11 +502,6 @@ async def apply_discriminator(
             for dn_value in discriminator_values
         ]
 
-    def mapping2value(field_mapping: dict[str, str | None]) -> str | None:
-        if len(field_mapping) != 1:
-            return None
-        return one(field_mapping.values())
-
     assert settings.discriminator_function in ["exclude", "include", "template"]
     # If the discriminator_function is template, discriminator values will be a
     # prioritized list of jinja templates (first meaning most important), and we will
@@ -393,16 +509,11 @@ async def apply_discriminator(
     # We do this by evaluating the jinja template and looking for outcomes with "True".
     # NOTE: We assume no two accounts are equally important.
     for discriminator in discriminator_values:
-        template = Template(discriminator)
+        template = compile_discriminator_template(discriminator)
         dns_passing_template = {
             dn
-            for dn in dns
-            if template.render(
-                dn=dn,
-                value=mapping2value(mapping[dn]),
-                **mapping[dn],
-            ).strip()
-            == "True"
+            for dn, context in contexts.items()
+            if template.render(**context).strip() == "True"
         }
         if dns_passing_template:
             return one(
@@ -525,15 +636,14 @@ async def paged_search(
         combine_dn_strings([ou, settings.ldap_search_base])
         for ou in settings.ldap_ous_to_search_in
     ]
-    results = []
-    for search_base in search_bases:
-        results.extend(
-            await _paged_search(
-                ldap_connection, searchParameters.copy(), search_base, mute
-            )
-        )
-
-    return results
+    # The OUs are searched concurrently, as the ASYNC strategy multiplexes searches
+    search_base_results = await asyncio.gather(
+        *[
+            _paged_search(ldap_connection, searchParameters.copy(), search_base, mute)
+            for search_base in search_bases
+        ]
+    )
+    return list(flatten(search_base_results))
 
 
 async def object_search(
@@ -560,14 +670,17 @@ async def object_search(
     """
     search_bases = ensure_list(searchParameters["search_base"])
 
-    responses = []
-    # TODO: Asyncio.gather this? - or combine the filters?
-    for search_base in search_bases:
-        response, _ = await ldap_search(
-            ldap_connection, **ChainMap(searchParameters, {"search_base": search_base})
-        )
-        if response:
-            responses.extend(response)
+    # NOTE: The search base must override the one in searchParameters, as that may
+    #       be the list of all search bases
+    search_base_results = await asyncio.gather(
+        *[
+            ldap_search(
+                ldap_connection, **(searchParameters | {"search_base": search_base})
+            )
+            for search_base in search_bases
+        ]
+    )
+    responses = list(flatten(response or [] for response, _ in search_base_results))
     search_entries = ldapresponse2entries(responses)
     return search_entries
 
@@ -622,6 +735,10 @@ def is_dn(value):
     """
     if not isinstance(value, str):
         return False
+    # Every RDN has an equals sign, which cheaply rules out most attribute values
+    # without raising and catching a parser exception
+    if "=" not in value:
+        return False
 
     try:
         safe_dn(value)
@@ -698,13 +815,14 @@ async def make_ldap_object(
         """
         return is_dn(value) and value != response["dn"]
 
+    # The nest flag is checked first, as probing every value for a DN is costly
     for attribute in attributes:
         value = response["attributes"][attribute]
-        if is_other_dn(value) and nest:
+        if nest and is_other_dn(value):
             ldap_dict[attribute] = await get_nested_ldap_object(value)
         elif is_list(value):
             ldap_dict[attribute] = [
-                (await get_nested_ldap_object(v)) if is_other_dn(v) and nest else v
+                (await get_nested_ldap_object(v)) if nest and is_other_dn(v) else v
                 for v in value
             ]
         else:
@@ -713,20 +831,47 @@ async def make_ldap_object(
     return LdapObject(**ldap_dict)
 
 
-def is_uuid(entity: Any) -> bool:
-    """
-    Check if a entity is a valid UUID
+def filter_ldap_object(
+    ldap_object: LdapObject,
+    attributes: list[str],
+    schema: SchemaInfo | None = None,
+) -> LdapObject:
+    """Restrict an LDAP object to a subset of its attributes.
+
+    Attributes are matched case-insensitively and without options, like LDAP does.
+    If the schema is given, an attribute is also matched by its aliases, as the
+    server may return an attribute by another name than the one requested.
+
+    Args:
+        ldap_object: The LDAP object to restrict.
+        attributes: The attributes to keep.
+        schema: The LDAP server schema to lookup attribute aliases in.
+
+    Returns:
+        A shallow copy of the LDAP object with only the DN and the given attributes.
     """
-    with suppress(ValueError):
-        UUID(str(entity))
-        return True
-    return False
+
+    def attribute_names(attribute: str) -> set[str]:
+        # Options such as ";binary" or ";range=0-1499" are not part of the name
+        name = attribute.split(";")[0]
+        names = {name}
+        if schema is not None and name in schema.attribute_types:
+            names.update(schema.attribute_types[name].name)
+        return {name.casefold() for name in names}
+
+    wanted = set().union(*map(attribute_names, attributes))
+    return LdapObject(
+        **{
+            key: value
+            for key, value in dict(ldap_object).items()
+            if key == "dn" or key.split(";")[0].casefold() in wanted
+        }
+    )
 
 
 def check_ou_in_list_of_ous(ou_to_check, list_of_ous):
     """
     Checks if a specific OU exists in a list of OUs. Raises ValueError if it does not
     """
-    any_ok = any(ou_to_check.endswith(ou) for ou in list_of_ous)
-    if not any_ok:
+    if not ou_to_check.endswith(tuple(list_of_ous)):
         raise ValueError(f"{ou_to_check} is not in {list_of_ous}")
@@ -47,6 +47,8 @@ async def http_process_uuid(
     converter: LdapConverter,
     uuid: Annotated[UUID, Body()],
 ) -> None:
+    # Explicit requests must not be ignored due to a stale objectClass
+    dataloader.ldapapi.non_employee_uuids_cache.pop(uuid)
     await handle_uuid(settings, sync_tool, dataloader, converter, uuid)
 
 
@@ -84,6 +86,10 @@ async def handle_uuid(
         logger.warning("LDAP event ignored due to ignore-list", ldap_uuid=uuid)
         return
 
+    if dataloader.ldapapi.non_employee_uuids_cache.get(uuid):
+        logger.info("Ignoring change: cached as not Employee objectClass")
+        return
+
     try:
         dn = await dataloader.ldapapi.get_ldap_dn(uuid)
     except NoObjectsReturnedException as exc:
@@ -92,11 +98,13 @@ async def handle_uuid(
 
     # Ignore changes to non-employee objects
     ldap_object = await get_ldap_object(
-        dataloader.ldapapi.ldap_connection, dn, attributes=["objectClass"]
+        dataloader.ldapapi.ldap_connection, dn, attributes=["objectClass"], nest=False
     )
     ldap_object_classes = ldap_object.objectClass  # type: ignore[attr-defined]
     employee_object_class = converter.settings.ldap_object_class
-    if employee_object_class not in ldap_object_classes:
+    # objectClass names are case-insensitive in LDAP
+    if employee_object_class.lower() not in {c.lower() for c in ldap_object_classes}:
+        dataloader.ldapapi.non_employee_uuids_cache.set(uuid, True)
         logger.info(
             "Ignoring change: not Employee objectClass",
             ldap_object_classes=ldap_object_classes,
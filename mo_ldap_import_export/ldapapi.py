@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
 import asyncio
+from collections import defaultdict
 from typing import Any
 from typing import cast
 from uuid import UUID
@@ -19,19 +20,20 @@ from more_itertools import only
 from more_itertools import partition
 
 from .config import Settings
+from .exceptions import MultipleObjectsReturnedException
 from .exceptions import NoObjectsReturnedException
 from .exceptions import ReadOnlyException
 from .ldap import get_ldap_object
 from .ldap import ldap_add
 from .ldap import ldap_modify
 from .ldap import ldap_modify_dn
-from .ldap import make_ldap_object
 from .ldap import object_search
 from .ldap import single_object_search
-from .ldap_classes import LdapObject
 from .types import DN
 from .types import CPRNumber
+from .utils import TTLCache
 from .utils import combine_dn_strings
+from .utils import ensure_list
 from .utils import extract_ou_from_dn
 from .utils import is_exception
 
@@ -42,6 +44,17 @@ class LDAPAPI:
     def __init__(self, settings: Settings, ldap_connection: Connection) -> None:
         self.settings = settings
         self.ldap_connection = ldap_connection
+        # The search bases are static for the lifetime of the settings, so we
+        # combine them once, rather than on every CPR lookup
+        self.search_bases = [
+            combine_dn_strings([ou, settings.ldap_search_base])
+            for ou in settings.ldap_ous_to_search_in
+        ]
+        # An entry's objectClass practically never changes, so LDAP objects found not
+        # to be employees are remembered, see handle_uuid.
+        self.non_employee_uuids_cache: TTLCache[UUID, bool] = TTLCache(
+            settings.ldap_non_employee_cache_ttl
+        )
 
     # TODO: Move this to settings?
     def ou_in_ous_to_write_to(self, dn: str) -> bool:
@@ -159,7 +172,7 @@ class LDAPAPI:
         """
         logger.info("Looking for LDAP object", dn=dn)
         ldap_object = await get_ldap_object(
-            self.ldap_connection, dn, [self.settings.ldap_unique_id_field]
+            self.ldap_connection, dn, [self.settings.ldap_unique_id_field], nest=False
         )
         uuid = getattr(ldap_object, self.settings.ldap_unique_id_field)
         if not uuid:
@@ -170,7 +183,15 @@ class LDAPAPI:
         return UUID(uuid)
 
     async def convert_ldap_uuids_to_dns(self, ldap_uuids: set[UUID]) -> set[DN]:
-        # TODO: DataLoader / bulk here instead of this
+        # Active Directory looks up objectGUIDs by binding them as the search base,
+        # as filtering on them requires their binary encoding, so we go one by one.
+        if self.settings.ldap_unique_id_field == "objectGUID":
+            return await self._convert_ldap_uuids_to_dns_one_by_one(ldap_uuids)
+        return await self._convert_ldap_uuids_to_dns_bulk(ldap_uuids)
+
+    async def _convert_ldap_uuids_to_dns_one_by_one(
+        self, ldap_uuids: set[UUID]
+    ) -> set[DN]:
         results = await asyncio.gather(
             *[self.get_ldap_dn(uuid) for uuid in ldap_uuids],
             return_exceptions=True,
@@ -191,12 +212,54 @@ class LDAPAPI:
             )
         return cast(set[DN], set(dns))
 
+    async def _convert_ldap_uuids_to_dns_bulk(self, ldap_uuids: set[UUID]) -> set[DN]:
+        if not ldap_uuids:
+            return set()
+
+        unique_id_field = self.settings.ldap_unique_id_field
+        logger.info("Looking for LDAP objects", unique_ldap_uuids=ldap_uuids)
+        uuid_filter = "".join(f"({unique_id_field}={uuid})" for uuid in ldap_uuids)
+        searchParameters = {
+            "search_base": self.settings.ldap_search_base,
+            "search_filter": f"(&(objectclass=*)(|{uuid_filter}))",
+            "attributes": [unique_id_field],
+        }
+        try:
+            search_results = await object_search(searchParameters, self.ldap_connection)
+        except LDAPNoSuchObjectResult:
+            search_results = []
+        except Exception as error:
+            raise ExceptionGroup(
+                "Exceptions during UUID2DN translation", [error]
+            ) from error
+
+        uuid2dns: dict[UUID, set[DN]] = defaultdict(set)
+        for search_result in search_results:
+            raw_uuid = one(ensure_list(search_result["attributes"][unique_id_field]))
+            uuid2dns[UUID(str(raw_uuid))].add(search_result["dn"])
+
+        if not_found := ldap_uuids - uuid2dns.keys():
+            logger.warning("Unable to convert LDAP UUIDs to DNs", not_found=not_found)
+        if multiple_found := {
+            uuid: dns for uuid, dns in uuid2dns.items() if len(dns) > 1
+        }:
+            raise ExceptionGroup(
+                "Exceptions during UUID2DN translation",
+                [
+                    MultipleObjectsReturnedException(
+                        f"Found multiple entries for {uuid}: {dns}"
+                    )
+                    for uuid, dns in multiple_found.items()
+                ],
+            )
+        return set().union(*uuid2dns.values())
+
     async def dn2cpr(self, dn: DN) -> CPRNumber | None:
         if self.settings.ldap_cpr_attribute is None:
             return None
 
         ldap_object = await get_ldap_object(
-            self.ldap_connection, dn, [self.settings.ldap_cpr_attribute]
+            self.ldap_connection, dn, [self.settings.ldap_cpr_attribute], nest=False
         )
         # Try to get the cpr number from LDAP and use that.
         raw_cpr_number = getattr(ldap_object, self.settings.ldap_cpr_attribute)
@@ -213,18 +276,12 @@ class LDAPAPI:
         if not self.settings.ldap_cpr_attribute:
             raise NoObjectsReturnedException("cpr_field is not configured")
 
-        search_base = self.settings.ldap_search_base
-        ous_to_search_in = self.settings.ldap_ous_to_search_in
-        search_bases = [
-            combine_dn_strings([ou, search_base]) for ou in ous_to_search_in
-        ]
-
         object_class = self.settings.ldap_object_class
         object_class_filter = f"objectclass={object_class}"
         cpr_filter = f"{self.settings.ldap_cpr_attribute}={cpr_number}"
 
         searchParameters = {
-            "search_base": search_bases,
+            "search_base": self.search_bases,
             "search_filter": f"(&({object_class_filter})({cpr_filter}))",
             "attributes": [],
         }
@@ -232,13 +289,11 @@ class LDAPAPI:
             search_results = await object_search(searchParameters, self.ldap_connection)
         except LDAPNoSuchObjectResult:
             return set()
-        ldap_objects: list[LdapObject] = [
-            await make_ldap_object(search_result, self.ldap_connection)
-            for search_result in search_results
-        ]
-        dns = {obj.dn for obj in ldap_objects}
+        # We only need the DNs, so there is no need to construct (and potentially
+        # nest) full LDAP objects from the attribute-less search results.
+        dns = {search_result["dn"] for search_result in search_results}
         logger.info("Found LDAP(s) object", dns=dns)
-        return set(dns)
+        return dns
 
     async def modify_ldap_object(
         self,
@@ -42,6 +42,7 @@ from .exceptions import http_reject_on_failure
 from .import_export import SyncTool
 from .ldap import check_ou_in_list_of_ous
 from .ldap import configure_ldap_connection
+from .ldap import ldap_connection_states
 from .ldap import ldap_healthcheck
 from .ldap_amqp import configure_ldap_amqpsystem
 from .ldap_amqp import ldap2mo_router
@@ -159,8 +160,9 @@ async def http_process_ituser(
     object_uuid: Annotated[UUID, Body()],
     graphql_client: depends.GraphQLClient,
     amqpsystem: depends.AMQPSystem,
+    dataloader: depends.DataLoader,
 ) -> None:
-    await handle_ituser(object_uuid, graphql_client, amqpsystem)
+    await handle_ituser(object_uuid, graphql_client, amqpsystem, dataloader)
 
 
 @amqp_router.register("ituser")
@@ -169,14 +171,16 @@ async def process_ituser(
     object_uuid: PayloadUUID,
     graphql_client: depends.GraphQLClient,
     amqpsystem: depends.AMQPSystem,
+    dataloader: depends.DataLoader,
 ) -> None:
-    await handle_ituser(object_uuid, graphql_client, amqpsystem)
+    await handle_ituser(object_uuid, graphql_client, amqpsystem, dataloader)
 
 
 async def handle_ituser(
     object_uuid: UUID,
     graphql_client: depends.GraphQLClient,
     amqpsystem: depends.AMQPSystem,
+    dataloader: depends.DataLoader,
 ) -> None:
     result = await graphql_client.read_ituser_employee_uuid(object_uuid)
     try:
@@ -185,6 +189,11 @@ async def handle_ituser(
         logger.warning("Unable to lookup ITUser", uuid=object_uuid)
         raise RejectMessage("Unable to lookup ITUser") from error
 
+    # The ITUser may have moved from another person, changed its user-key, or been
+    # terminated or detached, so any user-key it has ever had may be stale
+    for user_key in {validity.user_key for validity in obj.validities}:
+        dataloader.moapi.evict_ituser_lookup(user_key)
+
     if obj.current is None:
         logger.warning("ITUser not currently active", uuid=object_uuid)
         raise RejectMessage("ITUser not currently active")
@@ -194,6 +203,9 @@ async def handle_ituser(
         logger.warning("ITUser not attached to a person", uuid=object_uuid)
         raise RejectMessage("ITUser not attached to a person")
 
+    # A user-key may also have been overwritten without leaving a validity behind
+    dataloader.moapi.evict_employee_lookups(person_uuid)
+
     # TODO: Add support for refreshing persons with a certain ituser directly
     await graphql_client.employee_refresh(amqpsystem.exchange_name, [person_uuid])
 
@@ -270,8 +282,14 @@ async def open_ldap_connection(ldap_connection: Connection) -> AsyncIterator[Non
     Yields:
         None
     """
-    with ldap_connection:
-        yield
+    try:
+        with ldap_connection:
+            yield
+    finally:
+        # Shut down the threads waiting for responses on the closed connection
+        state = ldap_connection_states.pop(ldap_connection, None)
+        if state is not None:
+            state.close()
 
 
 @asynccontextmanager
@@ -3,6 +3,7 @@
 import asyncio
 from collections.abc import Generator
 from collections.abc import Sequence
+from contextlib import suppress
 from datetime import UTC
 from datetime import datetime
 from enum import Enum
@@ -57,6 +58,8 @@ from .models import Termination
 from .types import CPRNumber
 from .types import EmployeeUUID
 from .types import OrgUnitUUID
+from .utils import IndexedTTLCache
+from .utils import TTLCache
 from .utils import is_exception
 from .utils import star
 
@@ -269,25 +272,89 @@ class MOAPI:
         self.settings = settings
         self.graphql_client = graphql_client
         self.create_mo_class_lock = asyncio.Lock()
+        # NOTE: Only positive lookups are cached, as caching a miss could make us
+        #       create a duplicate employee right after another import created it.
+        self.cpr2uuids_cache: IndexedTTLCache[CPRNumber, EmployeeUUID] = (
+            IndexedTTLCache(settings.mo_lookup_cache_ttl)
+        )
+        self.ituser2uuids_cache: IndexedTTLCache[UUID, EmployeeUUID] = IndexedTTLCache(
+            settings.mo_lookup_cache_ttl
+        )
+        # IT systems and classes rarely change, but may be terminated and recreated
+        # by users, so found UUIDs only live as long as the other MO lookups.
+        self.it_system_uuids_cache: TTLCache[str, str] = TTLCache(
+            settings.mo_lookup_cache_ttl
+        )
+        self.class_uuids_cache: TTLCache[tuple[str, str], str] = TTLCache(
+            settings.mo_lookup_cache_ttl
+        )
+
+    def evict_employee_lookups(self, uuid: UUID) -> None:
+        """Evict cached CPR-number and ITUser lookups resolving to an employee.
+
+        Args:
+            uuid: UUID of the employee which has changed.
+        """
+        self.cpr2uuids_cache.evict_member(EmployeeUUID(uuid))
+        self.ituser2uuids_cache.evict_member(EmployeeUUID(uuid))
+
+    def evict_ituser_lookup(self, user_key: str) -> None:
+        """Evict the cached employee lookup for an ITUser user-key.
+
+        Args:
+            user_key: User-key of the ITUser which has changed.
+        """
+        # Only UUID user-keys are ever looked up, and thus cached
+        with suppress(ValueError):
+            self.ituser2uuids_cache.pop(UUID(user_key))
 
     async def find_mo_employee_uuid_via_ituser(
         self, unique_uuid: UUID
     ) -> set[EmployeeUUID]:
+        cached = self.ituser2uuids_cache.get(unique_uuid)
+        if cached is not None:
+            return set(cached)
+
         result = await self.graphql_client.read_employee_uuid_by_ituser_user_key(
             str(unique_uuid)
         )
-        return {
+        uuids = {
             EmployeeUUID(ituser.current.employee_uuid)
             for ituser in result.objects
             if ituser.current is not None and ituser.current.employee_uuid is not None
         }
+        if uuids:
+            self.ituser2uuids_cache.set(unique_uuid, frozenset(uuids))
+        return uuids
 
     async def get_it_system_uuid(self, itsystem_user_key: str) -> str:
+        cached = self.it_system_uuids_cache.get(itsystem_user_key)
+        if cached is not None:
+            return cached
+
         result = await self.graphql_client.read_itsystem_uuid(itsystem_user_key)
         exception = UUIDNotFoundException(
             f"itsystem not found, user_key: {itsystem_user_key}"
         )
-        return str(one(result.objects, too_short=exception).uuid)
+        it_system_uuid = str(one(result.objects, too_short=exception).uuid)
+        self.it_system_uuids_cache.set(itsystem_user_key, it_system_uuid)
+        return it_system_uuid
+
+    async def get_class_uuid(self, facet_user_key: str, class_user_key: str) -> str:
+        key = (facet_user_key, class_user_key)
+        cached = self.class_uuids_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = await self.graphql_client.read_class_uuid_by_facet_and_class_user_key(
+            facet_user_key, class_user_key
+        )
+        exception = UUIDNotFoundException(
+            f"class not found, facet_user_key: {facet_user_key} class_user_key: {class_user_key}"
+        )
+        class_uuid = str(one(result.objects, too_short=exception).uuid)
+        self.class_uuids_cache.set(key, class_uuid)
+        return class_uuid
 
     async def load_mo_employee(
         self, uuid: UUID, current_objects_only=True
@@ -828,6 +895,10 @@ class MOAPI:
             return result.uuid
 
     async def cpr2uuids(self, cpr_number: CPRNumber) -> set[EmployeeUUID]:
+        cached = self.cpr2uuids_cache.get(cpr_number)
+        if cached is not None:
+            return set(cached)
+
         try:
             result = await self.graphql_client.read_employee_uuid_by_cpr_number(
                 cpr_number
@@ -845,7 +916,10 @@ class MOAPI:
                 "Rejecting message due to invalid CPR number", cpr_number=cpr_number
             )
             raise InvalidCPR("Unable to lookup invalid CPR number") from multi_error
-        return {EmployeeUUID(employee.uuid) for employee in result.objects}
+        uuids = {EmployeeUUID(employee.uuid) for employee in result.objects}
+        if uuids:
+            self.cpr2uuids_cache.set(cpr_number, frozenset(uuids))
+        return uuids
 
     async def get_ancestors(self, uuid: OrgUnitUUID) -> list[OrgUnitUUID]:
         results = await self.graphql_client.read_org_unit_ancestors(uuid)
@@ -4,7 +4,6 @@
 
 import asyncio
 import csv
-import re
 from collections.abc import AsyncIterator
 from collections.abc import Awaitable
 from collections.abc import Callable
@@ -51,7 +50,6 @@ from .ldap_emit import publish_uuids
 from .types import DN
 from .types import CPRNumber
 from .types import EmployeeUUID
-from .utils import combine_dn_strings
 from .utils import ensure_list
 from .utils import extract_ou_from_dn
 
@@ -112,7 +110,8 @@ def get_ldap_attributes(ldap_connection: Connection, root_ldap_object: str):
 
 async def valid_cpr(cpr: str) -> CPRNumber:
     cpr = cpr.replace("-", "")
-    if not re.match(r"^\d{10}$", cpr):
+    # NOTE: isdecimal also accepts non-ASCII digits, hence the isascii check
+    if len(cpr) != 10 or not (cpr.isascii() and cpr.isdecimal()):
         raise InvalidCPR(f"{cpr} is not a valid cpr-number")
 
     return CPRNumber(cpr)
@@ -424,9 +423,7 @@ async def load_ldap_cpr_object(
     if not dataloader.settings.ldap_cpr_attribute:
         raise NoObjectsReturnedException("cpr_field is not configured")
 
-    search_base = dataloader.settings.ldap_search_base
-    ous_to_search_in = dataloader.settings.ldap_ous_to_search_in
-    search_bases = [combine_dn_strings([ou, search_base]) for ou in ous_to_search_in]
+    search_bases = dataloader.ldapapi.search_bases
     object_class = converter.settings.ldap_object_class
     attributes = converter.get_ldap_attributes(json_key) + additional_attributes
 
@@ -441,11 +438,12 @@ async def load_ldap_cpr_object(
     search_results = await object_search(
         searchParameters, dataloader.ldapapi.ldap_connection
     )
-    # TODO: Asyncio gather this
-    ldap_objects: list[LdapObject] = [
-        await make_ldap_object(search_result, dataloader.ldapapi.ldap_connection)
-        for search_result in search_results
-    ]
+    ldap_objects: list[LdapObject] = await asyncio.gather(
+        *[
+            make_ldap_object(search_result, dataloader.ldapapi.ldap_connection)
+            for search_result in search_results
+        ]
+    )
     dns = [obj.dn for obj in ldap_objects]
     logger.info("Found LDAP(s) object", dns=dns)
     return ldap_objects
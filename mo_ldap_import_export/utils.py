@@ -4,11 +4,15 @@ import copy
 import re
 from collections.abc import Callable
 from collections.abc import Iterable
+from datetime import UTC
 from datetime import datetime
 from datetime import time
+from functools import lru_cache
 from functools import partial
 from functools import wraps
+from time import monotonic
 from typing import Any
+from typing import Generic
 from typing import TypeVar
 from zoneinfo import ZoneInfo
 
@@ -29,6 +33,9 @@ logger = structlog.stdlib.get_logger()
 
 T = TypeVar("T")
 R = TypeVar("R")
+K = TypeVar("K")
+V = TypeVar("V")
+M = TypeVar("M")
 
 MO_TZ = ZoneInfo("Europe/Copenhagen")
 
@@ -72,22 +79,6 @@ def delete_keys_from_dict(dict_del, lst_keys):
     return _delete_keys_from_dict(copy.deepcopy(dict_del), lst_keys)
 
 
-# TODO: this doesn't work in any possible definition of the word "work". Delete
-# as soon as we pass GraphQL objects around.
-def mo_datestring_to_utc(datestring: str | None) -> datetime | None:
-    """
-    Returns datetime object at UTC+0
-
-    Notes
-    ------
-    Mo datestrings are formatted like this: "2023-02-27T00:00:00+01:00"
-    This function essentially removes the "+01:00" part, which gives a UTC+0 timestamp.
-    """
-    if datestring is None:
-        return None
-    return datetime.fromisoformat(datestring).replace(tzinfo=None)
-
-
 def combine_dn_strings(dn_strings: list[str]) -> str:
     """
     Combine LDAP DN strings, skipping if a string is empty
@@ -105,6 +96,8 @@ def remove_vowels(string: str) -> str:
     return re.sub("[aeiouAEIOU]", "", string)
 
 
+# DN parsing is pure, and the same DNs are checked over and over
+@lru_cache(maxsize=8192)
 def extract_part_from_dn(dn: str, index_string: str) -> str:
     """
     Extract a part from an LDAP DN string
@@ -169,8 +162,7 @@ def ensure_list(x: Any | list[Any]) -> list[Any]:
     return [x]
 
 
-# TODO: Refactor this to use structured object
-def get_delete_flag(mo_object: dict[str, Any]) -> bool:
+def get_delete_flag(mo_object: Address | Engagement | ITUser) -> bool:
     """Determines if an object should be deleted based on the validity to-date.
 
     Args:
@@ -179,11 +171,8 @@ def get_delete_flag(mo_object: dict[str, Any]) -> bool:
     Returns:
         Whether the object should be deleted or not.
     """
-    # TODO: use timezone-aware datetime for now. GraphQL objects are already
-    # timezone-aware, so we can delete all parsing logic from here when we rid
-    # ourselves of the ramodels infestation.
-    now = datetime.utcnow()
-    validity_to = mo_datestring_to_utc(mo_object["validity"]["to"])
+    now = datetime.now(UTC)
+    validity_to = mo_object.validity.end
     if validity_to and validity_to <= now:
         logger.info(
             "Returning delete=True because to_date <= current_date",
@@ -205,3 +194,106 @@ def star(func):
 def bucketdict(iterable: Iterable[T], key: Callable[[T], R]) -> dict[R, list[T]]:
     buck = bucket(iterable, key)
     return {key: list(buck[key]) for key in buck}
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-memory cache whose entries expire after a time-to-live.
+
+    Expired entries are evicted lazily on lookup, and the oldest entry is evicted
+    whenever the cache is full. A non-positive `ttl` disables caching entirely.
+
+    Args:
+        ttl: Number of seconds an entry stays valid.
+        maxsize: Maximum number of entries to keep.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10_000) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[K, tuple[float, V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """Lookup a non-expired entry.
+
+        Args:
+            key: The key to lookup.
+
+        Returns:
+            The cached value or None if missing or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            self._discard(key)
+            return None
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Insert or replace an entry.
+
+        Args:
+            key: The key to insert.
+            value: The value to cache.
+        """
+        if self.ttl <= 0:
+            return
+        self._discard(key)
+        if len(self._data) >= self.maxsize:
+            self._discard(next(iter(self._data)))
+        self._data[key] = (monotonic() + self.ttl, value)
+
+    def pop(self, key: K) -> None:
+        """Evict a single entry if present."""
+        self._discard(key)
+
+    def clear(self) -> None:
+        """Evict all entries."""
+        self._data.clear()
+
+    def _discard(self, key: K) -> None:
+        self._data.pop(key, None)
+
+
+class IndexedTTLCache(TTLCache[K, frozenset[M]], Generic[K, M]):
+    """TTLCache of sets, which can evict all entries containing a given member.
+
+    A reverse index from members to keys is kept alongside the entries, so
+    evicting by member only touches the entries containing it.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10_000) -> None:
+        super().__init__(ttl, maxsize)
+        self._index: dict[M, set[K]] = {}
+
+    def set(self, key: K, value: frozenset[M]) -> None:
+        super().set(key, value)
+        if key not in self._data:
+            return
+        for member in value:
+            self._index.setdefault(member, set()).add(key)
+
+    def evict_member(self, member: M) -> None:
+        """Evict all entries whose value contains the member."""
+        for key in self._index.pop(member, set()):
+            self._discard(key)
+
+    def clear(self) -> None:
+        super().clear()
+        self._index.clear()
+
+    def _discard(self, key: K) -> None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        for member in entry[1]:
+            keys = self._index.get(member)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._index[member]
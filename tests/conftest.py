@@ -276,6 +276,7 @@ def dataloader(
     dataloader.load_ldap_attribute_values = AsyncMock()
     dataloader.modify_ldap_object.return_value = [{"description": "success"}]
     dataloader.get_ldap_objectGUID = sync_dataloader
+    dataloader.moapi.evict_employee_lookups = sync_dataloader
 
     dataloader.load_ldap_OUs = AsyncMock()
     dataloader.move_ldap_object = AsyncMock()
@@ -323,7 +324,9 @@ def converter() -> MagicMock:
 
 @pytest.fixture
 def settings_mock() -> MagicMock:
-    return MagicMock()
+    settings = MagicMock()
+    settings.mo_lookup_cache_ttl = 60
+    return settings
 
 
 @pytest.fixture
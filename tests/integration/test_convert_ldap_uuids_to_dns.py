@@ -1,6 +1,5 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
-from unittest import TestCase
 from unittest.mock import ANY
 from unittest.mock import MagicMock
 from uuid import UUID
@@ -43,9 +42,9 @@ async def test_convert_ldap_uuids_to_dns(
 
     assert cap_logs == [
         {
-            "event": "Looking for LDAP object",
+            "event": "Looking for LDAP objects",
             "log_level": "info",
-            "unique_ldap_uuid": missing_uuid,
+            "unique_ldap_uuids": {missing_uuid},
         },
         {
             "event": "Unable to convert LDAP UUIDs to DNs",
@@ -61,9 +60,9 @@ async def test_convert_ldap_uuids_to_dns(
 
     assert cap_logs == [
         {
-            "event": "Looking for LDAP object",
+            "event": "Looking for LDAP objects",
             "log_level": "info",
-            "unique_ldap_uuid": ldap_person_uuid,
+            "unique_ldap_uuids": {ldap_person_uuid},
         },
     ]
 
@@ -74,26 +73,18 @@ async def test_convert_ldap_uuids_to_dns(
         )
         assert result == {"uid=abk,ou=os2mo,o=magenta,dc=magenta,dc=dk"}
 
-    TestCase().assertCountEqual(
-        cap_logs,
-        [
-            {
-                "event": "Looking for LDAP object",
-                "log_level": "info",
-                "unique_ldap_uuid": ldap_person_uuid,
-            },
-            {
-                "event": "Looking for LDAP object",
-                "log_level": "info",
-                "unique_ldap_uuid": missing_uuid,
-            },
-            {
-                "event": "Unable to convert LDAP UUIDs to DNs",
-                "log_level": "warning",
-                "not_found": ANY,
-            },
-        ],
-    )
+    assert cap_logs == [
+        {
+            "event": "Looking for LDAP objects",
+            "log_level": "info",
+            "unique_ldap_uuids": {ldap_person_uuid, missing_uuid},
+        },
+        {
+            "event": "Unable to convert LDAP UUIDs to DNs",
+            "log_level": "warning",
+            "not_found": {missing_uuid},
+        },
+    ]
 
     # Convert existing UUID, but LDAP is down
     # Save original socket to restore it later
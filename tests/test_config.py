@@ -457,13 +457,17 @@ async def test_combine_discriminator_fields(
 
 
 @pytest.mark.parametrize("field", ["dn", "value"])
+@pytest.mark.parametrize("env_var", ["DISCRIMINATOR_FIELD", "DISCRIMINATOR_FIELDS"])
 @pytest.mark.usefixtures("minimal_valid_environmental_variables")
 async def test_disallowed_discriminator_fields(
-    monkeypatch: pytest.MonkeyPatch, field: str
+    monkeypatch: pytest.MonkeyPatch, env_var: str, field: str
 ) -> None:
     monkeypatch.setenv("DISCRIMINATOR_FUNCTION", "include")
     monkeypatch.setenv("DISCRIMINATOR_VALUES", '["test"]')
-    monkeypatch.setenv("DISCRIMINATOR_FIELD", field)
+    if env_var == "DISCRIMINATOR_FIELDS":
+        monkeypatch.setenv(env_var, json.dumps(["sn", field]))
+    else:
+        monkeypatch.setenv(env_var, field)
 
     with pytest.raises(ValueError) as exc_info:
         Settings()
@@ -481,9 +481,8 @@ async def test_get_employee_address_type_uuid(
     graphql_client.read_class_uuid_by_facet_and_class_user_key.map[
         ("employee_address_type", class_name)
     ] = class_uuid
-    assert (
-        await get_employee_address_type_uuid(graphql_client, class_name) == class_uuid
-    )
+    moapi = MOAPI(Settings(), graphql_client)
+    assert await get_employee_address_type_uuid(moapi, class_name) == class_uuid
 
 
 @pytest.mark.parametrize("class_name", ["Hemmelig", "Offentlig"])
@@ -493,14 +492,15 @@ async def test_get_visibility_uuid(graphql_client: AsyncMock, class_name: str) -
     graphql_client.read_class_uuid_by_facet_and_class_user_key.map[
         ("visibility", class_name)
     ] = class_uuid
-    assert await get_visibility_uuid(graphql_client, class_name) == class_uuid
+    moapi = MOAPI(Settings(), graphql_client)
+    assert await get_visibility_uuid(moapi, class_name) == class_uuid
 
 
 async def test_get_job_function_uuid(
     graphql_mock: GraphQLMocker, dataloader: AsyncMock
 ) -> None:
     graphql_client = GraphQLClient("http://example.com/graphql")
-    moapi = MOAPI(dataloader.settings, graphql_client)
+    moapi = MOAPI(Settings(), graphql_client)
 
     route = graphql_mock.query("read_class_uuid_by_facet_and_class_user_key")
 
@@ -516,8 +516,13 @@ async def test_get_job_function_uuid(
     assert route.called
     route.reset()
 
+    # Found classes are cached
+    assert await get_or_create_job_function_uuid(moapi, "Major") == uuid1
+    assert not route.called
+
     new_uuid = uuid4()
     moapi = AsyncMock()
+    moapi.get_class_uuid.side_effect = UUIDNotFoundException("class not found")
     moapi.create_mo_class.return_value = new_uuid
 
     result = await get_or_create_job_function_uuid(moapi, "non-existing_job")
@@ -535,6 +540,7 @@ async def test_get_job_function_uuid_default_kwarg(dataloader: AsyncMock) -> Non
     # Arrange: mock the UUID of a newly created job function
     uuid_for_new_job_function = str(uuid4())
     moapi = AsyncMock()
+    moapi.get_class_uuid.side_effect = UUIDNotFoundException("class not found")
     moapi.create_mo_class.return_value = uuid_for_new_job_function
 
     # Act
@@ -552,6 +558,7 @@ async def test_get_job_function_uuid_default_kwarg_does_not_override(
     # Arrange
     uuid = str(uuid4())
     moapi = AsyncMock()
+    moapi.get_class_uuid.side_effect = UUIDNotFoundException("class not found")
     moapi.create_mo_class.return_value = uuid
 
     # Act
@@ -615,10 +622,13 @@ async def test_get_it_system_uuid(
     route = graphql_mock.query("read_itsystem_uuid")
     route.result = {"itsystems": {"objects": [{"uuid": it_system_uuid}]}}
 
-    assert await MOAPI(settings_mock, graphql_client).get_it_system_uuid(
-        it_system_user_key
-    ) == str(it_system_uuid)
-    assert route.called
+    moapi = MOAPI(settings_mock, graphql_client)
+    assert await moapi.get_it_system_uuid(it_system_user_key) == str(it_system_uuid)
+    assert route.call_count == 1
+
+    # Found UUIDs are cached
+    assert await moapi.get_it_system_uuid(it_system_user_key) == str(it_system_uuid)
+    assert route.call_count == 1
 
     route.reset()
     route.result = {"itsystems": {"objects": []}}
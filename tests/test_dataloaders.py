@@ -10,6 +10,7 @@ import time
 from collections.abc import Collection
 from collections.abc import Iterator
 from typing import Any
+from typing import cast
 from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
 from unittest.mock import patch
@@ -386,6 +387,56 @@ async def test_find_mo_employee_uuid_by_cpr_number(dataloader: DataLoader):
         assert output == uuid
 
 
+async def test_cpr2uuids_cache(dataloader: DataLoader) -> None:
+    uuid = uuid4()
+    cpr_number = CPRNumber("0101011221")
+    read_employee_uuid_by_cpr_number = cast(
+        AsyncMock, dataloader.moapi.graphql_client.read_employee_uuid_by_cpr_number
+    )
+
+    # Misses are not cached
+    mock_read_employee_uuid_by_cpr_number(dataloader, [])
+    assert await dataloader.moapi.cpr2uuids(cpr_number) == set()
+    assert await dataloader.moapi.cpr2uuids(cpr_number) == set()
+    assert read_employee_uuid_by_cpr_number.await_count == 2
+
+    # Hits are cached
+    mock_read_employee_uuid_by_cpr_number(dataloader, [uuid])
+    assert await dataloader.moapi.cpr2uuids(cpr_number) == {uuid}
+    assert await dataloader.moapi.cpr2uuids(cpr_number) == {uuid}
+    assert read_employee_uuid_by_cpr_number.await_count == 3
+
+    # Hits are evicted when the employee changes
+    dataloader.moapi.evict_employee_lookups(uuid)
+    assert await dataloader.moapi.cpr2uuids(cpr_number) == {uuid}
+    assert read_employee_uuid_by_cpr_number.await_count == 4
+
+
+async def test_find_mo_employee_uuid_via_ituser_cache(dataloader: DataLoader) -> None:
+    uuid = uuid4()
+    unique_uuid = uuid4()
+    read_employee_uuid_by_ituser_user_key = cast(
+        AsyncMock, dataloader.moapi.graphql_client.read_employee_uuid_by_ituser_user_key
+    )
+
+    mock_read_employee_uuid_by_ituser(dataloader, [uuid])
+    assert await dataloader.moapi.find_mo_employee_uuid_via_ituser(unique_uuid) == {
+        uuid
+    }
+    assert await dataloader.moapi.find_mo_employee_uuid_via_ituser(unique_uuid) == {
+        uuid
+    }
+    assert read_employee_uuid_by_ituser_user_key.await_count == 1
+
+    # Hits are evicted when the ITUser changes
+    dataloader.moapi.evict_ituser_lookup("not-a-uuid")
+    dataloader.moapi.evict_ituser_lookup(str(unique_uuid))
+    assert await dataloader.moapi.find_mo_employee_uuid_via_ituser(unique_uuid) == {
+        uuid
+    }
+    assert read_employee_uuid_by_ituser_user_key.await_count == 2
+
+
 async def test_find_mo_employee_uuid_by_ituser(dataloader: DataLoader):
     uuid = uuid4()
 
@@ -481,6 +532,28 @@ async def test_find_mo_employee_uuid_multiple_matches(dataloader: DataLoader):
         assert output == uuid1
 
 
+async def test_find_mo_employee_uuid_cpr_number_ignores_ituser(
+    dataloader: DataLoader,
+) -> None:
+    uuid = uuid4()
+
+    ldap_object = LdapObject(
+        dn="CN=foo", employeeID="0101011221", objectGUID=str(uuid4())
+    )
+    with patch(
+        "mo_ldap_import_export.ldapapi.get_ldap_object", return_value=ldap_object
+    ):
+        # The CPR match is conclusive, so the ITUser lookup is never made
+        mock_read_employee_uuid_by_cpr_number(dataloader, [uuid])
+        read_employee_uuid_by_ituser_user_key = cast(
+            AsyncMock,
+            dataloader.moapi.graphql_client.read_employee_uuid_by_ituser_user_key,
+        )
+        output = await dataloader.find_mo_employee_uuid("CN=foo")
+        assert output == uuid
+        read_employee_uuid_by_ituser_user_key.assert_not_awaited()
+
+
 async def test_load_mo_employee_not_found(
     dataloader: DataLoader, legacy_graphql_session: AsyncMock
 ):
@@ -779,15 +852,19 @@ async def test_get_ldap_it_system_uuid(
 ) -> None:
     uuid = uuid4()
     route = graphql_mock.query("read_itsystem_uuid")
-    route.result = {"itsystems": {"objects": [{"uuid": uuid}]}}
+    route.result = {"itsystems": {"objects": []}}
+    assert await dataloader.moapi.get_ldap_it_system_uuid() is None
+    assert route.called
 
+    route.reset()
+    route.result = {"itsystems": {"objects": [{"uuid": uuid}]}}
     assert await dataloader.moapi.get_ldap_it_system_uuid() == str(uuid)
     assert route.called
 
+    # The found UUID is cached by get_it_system_uuid
     route.reset()
-    route.result = {"itsystems": {"objects": []}}
-    assert await dataloader.moapi.get_ldap_it_system_uuid() is None
-    assert route.called
+    assert await dataloader.moapi.get_ldap_it_system_uuid() == str(uuid)
+    assert not route.called
 
 
 async def test_find_mo_employee_dn(dataloader: MagicMock) -> None:
@@ -1612,9 +1689,13 @@ async def test_find_mo_employee_dn_by_itsystem_no_match(
     route2 = graphql_mock.query("read_ituser_by_employee_and_itsystem_uuid")
     route2.result = {"itusers": {"objects": []}}
 
+    dataloader.ldapapi.convert_ldap_uuids_to_dns = AsyncMock()  # type: ignore
+
     result = await dataloader.find_mo_employee_dn_by_itsystem(employee_uuid)
     assert result == set()
 
+    dataloader.ldapapi.convert_ldap_uuids_to_dns.assert_not_awaited()
+
 
 @pytest.mark.envvar({"LDAP_IT_SYSTEM": "ADUUID"})
 async def test_find_mo_employee_dn_by_itsystem(
@@ -28,6 +28,7 @@ from mo_ldap_import_export.dataloaders import DataLoader
 from mo_ldap_import_export.depends import GraphQLClient
 from mo_ldap_import_export.import_export import SyncTool
 from mo_ldap_import_export.ldap import apply_discriminator
+from mo_ldap_import_export.ldap import compile_discriminator_template
 from mo_ldap_import_export.ldap import configure_ldap_connection
 from mo_ldap_import_export.ldap import construct_server_pool
 from mo_ldap_import_export.ldap import get_ldap_object
@@ -417,6 +418,12 @@ async def test_apply_discriminator_exclude_one_user(
     assert result == expected
 
 
+def test_compile_discriminator_template() -> None:
+    template = compile_discriminator_template("{{ value == 'foo' }}")
+    assert template.render(value="foo") == "True"
+    assert compile_discriminator_template("{{ value == 'foo' }}") is template
+
+
 @pytest.mark.parametrize("discriminator_function", ("include", "exclude"))
 async def test_apply_discriminator_exclude_none(
     ldap_connection: Connection,
@@ -3,11 +3,15 @@
 # -*- coding: utf-8 -*-
 import datetime
 from unittest.mock import MagicMock
+from uuid import uuid4
 
+from mo_ldap_import_export.autogenerated_graphql_client.client import GraphQLClient
 from mo_ldap_import_export.environments import construct_environment
 from mo_ldap_import_export.environments import filter_mo_datestring
 from mo_ldap_import_export.environments import filter_remove_curly_brackets
 from mo_ldap_import_export.environments import filter_strip_non_digits
+from mo_ldap_import_export.environments import get_employment_interval
+from tests.graphql_mocker import GraphQLMocker
 
 
 def test_strip_non_digits() -> None:
@@ -15,6 +19,8 @@ def test_strip_non_digits() -> None:
     assert filter_strip_non_digits("01/01/01-1234") == "0101011234"
     assert filter_strip_non_digits("010101-1234") == "0101011234"
     assert filter_strip_non_digits(101011234) is None
+    # Only ASCII digits are kept
+    assert filter_strip_non_digits("0101\u0661\u06621234") == "01011234"
 
 
 def test_filter_mo_datestring():
@@ -42,3 +48,30 @@ def test_bitwise_and():
 
     result = bitwise_template.render(input=0x08, mask=0x03)
     assert result == "0"
+
+
+def test_compile_template() -> None:
+    environment = construct_environment(MagicMock(), MagicMock())
+    template = environment.compile_template("{{ 1 + 1 }}")
+    assert template.render() == "2"
+
+    # Compiled templates are reused per environment
+    assert environment.compile_template("{{ 1 + 1 }}") is template
+    assert environment.compile_template("{{ 2 + 2 }}") is not template
+
+    other_environment = construct_environment(MagicMock(), MagicMock())
+    other_template = other_environment.compile_template("{{ 1 + 1 }}")
+    assert other_template is not template
+    assert other_template.environment is other_environment
+
+
+async def test_get_employment_interval_without_validities(
+    graphql_mock: GraphQLMocker,
+) -> None:
+    graphql_client = GraphQLClient("http://example.com/graphql")
+
+    route = graphql_mock.query("read_engagement_enddate")
+    route.result = {"engagements": {"objects": [{"validities": []}]}}
+
+    assert await get_employment_interval(graphql_client, uuid4()) == (None, None)
+    assert route.called
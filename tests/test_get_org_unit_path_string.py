@@ -10,6 +10,7 @@ from mo_ldap_import_export.autogenerated_graphql_client.input_types import (
     OrganisationUnitCreateInput,
 )
 from mo_ldap_import_export.environments import get_org_unit_path_string
+from mo_ldap_import_export.environments import memoize_template_lookups
 from tests.graphql_mocker import GraphQLMocker
 
 
@@ -96,3 +97,30 @@ async def test_get_org_unit_path_string(graphql_mock: GraphQLMocker) -> None:
     assert (
         path == "Kolding Kommune\\Sundhed\\Plejecentre\\Plejecenter Nord\\Teknik Nord"
     )
+
+
+async def test_get_org_unit_path_string_memoized(graphql_mock: GraphQLMocker) -> None:
+    graphql_client = GraphQLClient("http://example.com/graphql")
+
+    route = graphql_mock.query("read_org_unit_ancestor_names")
+    route.result = {
+        "org_units": {
+            "objects": [
+                {"current": {"name": "Sundhed", "ancestors": [{"name": "Kolding"}]}}
+            ]
+        }
+    }
+
+    uuid = uuid4()
+    with memoize_template_lookups():
+        assert await get_org_unit_path_string(graphql_client, "\\", uuid) == (
+            "Kolding\\Sundhed"
+        )
+        assert await get_org_unit_path_string(graphql_client, "/", uuid) == (
+            "Kolding/Sundhed"
+        )
+    assert route.call_count == 1
+
+    # Outside the context every lookup goes to MO
+    await get_org_unit_path_string(graphql_client, "\\", uuid)
+    assert route.call_count == 2
@@ -25,9 +25,13 @@ from structlog.testing import capture_logs
 from mo_ldap_import_export.config import Settings
 from mo_ldap_import_export.depends import GraphQLClient
 from mo_ldap_import_export.environments import construct_environment
+from mo_ldap_import_export.environments import get_primary_engagement_uuid
+from mo_ldap_import_export.environments import memoize_template_lookups
+from mo_ldap_import_export.environments import primary_engagement_cache
 from mo_ldap_import_export.exceptions import DNNotFound
 from mo_ldap_import_export.exceptions import NoObjectsReturnedException
 from mo_ldap_import_export.import_export import SyncTool
+from mo_ldap_import_export.ldap_classes import LdapObject
 from mo_ldap_import_export.main import handle_org_unit
 from mo_ldap_import_export.moapi import Verb
 from mo_ldap_import_export.moapi import get_primary_engagement
@@ -685,7 +689,10 @@ async def test_import_single_object_forces_json_key_ordering(
     # Act: run the method and collect logs
     with (
         capture_logs() as cap_logs,
-        patch("mo_ldap_import_export.import_export.get_ldap_object"),
+        patch(
+            "mo_ldap_import_export.import_export.get_ldap_object",
+            return_value=LdapObject(dn="CN=foo"),
+        ),
     ):
         await sync_tool.import_single_user("CN=foo")
         # Assert: verify that we process JSON keys in the expected order, regardless of
@@ -698,6 +705,70 @@ async def test_import_single_object_forces_json_key_ordering(
         assert logged_json_keys == ["Employee", "Engagement", "Address"]
 
 
+@pytest.mark.usefixtures("fake_find_mo_employee_dn")
+async def test_import_single_user_reads_ldap_once(
+    converter: MagicMock, sync_tool: SyncTool
+) -> None:
+    sync_tool.settings.conversion_mapping.ldap_to_mo.keys.return_value = {  # type: ignore
+        "Employee",
+        "Engagement",
+        "Address",
+    }
+    converter.get_ldap_attributes.side_effect = lambda json_key: [json_key.lower()]
+    converter.from_ldap.return_value = []
+
+    ldap_object = LdapObject(
+        dn="CN=foo", employee="foo", engagement="bar", address="baz"
+    )
+    with patch(
+        "mo_ldap_import_export.import_export.get_ldap_object",
+        return_value=ldap_object,
+    ) as get_ldap_object:
+        await sync_tool.import_single_user("CN=foo")
+
+    get_ldap_object.assert_awaited_once()
+    assert set(get_ldap_object.call_args.args[2]) == {
+        "employee",
+        "engagement",
+        "address",
+    }
+    # Each entity is only given its own attributes
+    loaded_objects = {
+        call.args[1]: call.args[0] for call in converter.from_ldap.call_args_list
+    }
+    assert loaded_objects == {
+        "Employee": LdapObject(dn="CN=foo", employee="foo"),
+        "Engagement": LdapObject(dn="CN=foo", engagement="bar"),
+        "Address": LdapObject(dn="CN=foo", address="baz"),
+    }
+
+
+@pytest.mark.usefixtures("fake_find_mo_employee_dn")
+async def test_import_single_user_does_not_memoize_lookups(
+    converter: MagicMock, sync_tool: SyncTool
+) -> None:
+    sync_tool.settings.conversion_mapping.ldap_to_mo.keys.return_value = {  # type: ignore
+        "Employee",
+        "Engagement",
+    }
+    # The engagement is written to MO midway, so later templates must not see a
+    # primary engagement memoised before it
+    caches = []
+
+    async def from_ldap(*args: Any, **kwargs: Any) -> list:
+        caches.append(primary_engagement_cache.get())
+        return []
+
+    converter.from_ldap.side_effect = from_ldap
+    with patch(
+        "mo_ldap_import_export.import_export.get_ldap_object",
+        return_value=LdapObject(dn="CN=foo"),
+    ):
+        await sync_tool.import_single_user("CN=foo")
+
+    assert caches == [None, None]
+
+
 async def test_wait_for_import_to_finish(sync_tool: SyncTool):
     wait_for_import_to_finish = partial(sync_tool.wait_for_import_to_finish)
 
@@ -785,7 +856,10 @@ async def test_import_jobtitlefromadtomo_objects(
             "mo_ldap_import_export.import_export.SyncTool.format_converted_objects",
             return_value=formatted_objects,
         ),
-        patch("mo_ldap_import_export.import_export.get_ldap_object"),
+        patch(
+            "mo_ldap_import_export.import_export.get_ldap_object",
+            return_value=LdapObject(dn="CN=foo"),
+        ),
     ):
         await sync_tool.import_single_user(fake_dn)
 
@@ -833,7 +907,10 @@ async def test_import_single_user_entity(sync_tool: SyncTool) -> None:
     employee_uuid = uuid4()
     with (
         capture_logs() as cap_logs,
-        patch("mo_ldap_import_export.import_export.get_ldap_object"),
+        patch(
+            "mo_ldap_import_export.import_export.get_ldap_object",
+            return_value=LdapObject(dn="CN=foo"),
+        ),
     ):
         await sync_tool.import_single_user_entity(json_key, dn, employee_uuid)
 
@@ -1090,6 +1167,34 @@ async def test_get_primary_engagement(
     assert route.called
 
 
+async def test_get_primary_engagement_uuid_memoized(
+    graphql_mock: GraphQLMocker,
+) -> None:
+    graphql_client = GraphQLClient("http://example.com/graphql")
+
+    employee_uuid = EmployeeUUID(uuid4())
+    engagement_uuid = uuid4()
+
+    route = graphql_mock.query("read_engagements_is_primary")
+    route.result = {
+        "engagements": {
+            "objects": [
+                {"validities": [construct_validity(True, current, engagement_uuid)]}
+            ]
+        }
+    }
+
+    with memoize_template_lookups():
+        for _ in range(3):
+            result = await get_primary_engagement_uuid(graphql_client, employee_uuid)
+            assert result == engagement_uuid
+    assert route.call_count == 1
+
+    # Outside the context every lookup goes to MO
+    await get_primary_engagement_uuid(graphql_client, employee_uuid)
+    assert route.call_count == 2
+
+
 async def test_find_best_dn(sync_tool: SyncTool) -> None:
     dn = "CN=foo"
     sync_tool.dataloader.find_mo_employee_dn.return_value = set()  # type: ignore
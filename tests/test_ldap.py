@@ -3,6 +3,7 @@
 import asyncio
 import datetime
 import os
+import threading
 import time
 from collections.abc import Iterator
 from contextlib import suppress
@@ -18,6 +19,7 @@ from fastramqpi.context import Context
 from ldap3 import MOCK_SYNC
 from ldap3 import Connection
 from ldap3 import Server
+from ldap3.protocol.rfc4512 import SchemaInfo
 from more_itertools import collapse
 from pydantic import parse_obj_as
 from structlog.testing import capture_logs
@@ -29,14 +31,19 @@ from mo_ldap_import_export.config import Settings
 from mo_ldap_import_export.exceptions import MultipleObjectsReturnedException
 from mo_ldap_import_export.exceptions import NoObjectsReturnedException
 from mo_ldap_import_export.exceptions import TimeOutException
+from mo_ldap_import_export.ldap import LDAPConnectionState
 from mo_ldap_import_export.ldap import check_ou_in_list_of_ous
 from mo_ldap_import_export.ldap import configure_ldap_connection
 from mo_ldap_import_export.ldap import construct_server
+from mo_ldap_import_export.ldap import filter_ldap_object
 from mo_ldap_import_export.ldap import get_client_strategy
 from mo_ldap_import_export.ldap import is_dn
-from mo_ldap_import_export.ldap import is_uuid
+from mo_ldap_import_export.ldap import ldap_concurrency_limit
+from mo_ldap_import_export.ldap import ldap_connection_states
 from mo_ldap_import_export.ldap import ldap_healthcheck
+from mo_ldap_import_export.ldap import ldap_search
 from mo_ldap_import_export.ldap import make_ldap_object
+from mo_ldap_import_export.ldap import object_search
 from mo_ldap_import_export.ldap import paged_search
 from mo_ldap_import_export.ldap import single_object_search
 from mo_ldap_import_export.ldap_classes import LdapObject
@@ -195,6 +202,44 @@ def test_configure_ldap_connection(load_settings_overrides: dict[str, str]) -> N
         assert isinstance(connection, Connection)
 
 
+async def test_ldap_concurrency_limit(
+    load_settings_overrides: dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LDAP_MAX_CONCURRENCY", "2")
+    settings = Settings()
+
+    with patch(
+        "mo_ldap_import_export.ldap.get_client_strategy", return_value=MOCK_SYNC
+    ):
+        connection = configure_ldap_connection(settings)
+    semaphore = ldap_concurrency_limit(connection)
+    assert isinstance(semaphore, asyncio.Semaphore)
+    state = ldap_connection_states[connection]
+
+    lock = threading.Lock()
+    # Holds each response until the limit is reached, so the peak is deterministic
+    barrier = threading.Barrier(2, timeout=5)
+    in_flight = 0
+    max_in_flight = 0
+
+    def get_response(message_id: int) -> tuple[list, dict]:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        barrier.wait()
+        with lock:
+            in_flight -= 1
+        return [], {}
+
+    ldap_connection = MagicMock()
+    ldap_connection.get_response = get_response
+    ldap_connection_states[ldap_connection] = state
+
+    await asyncio.gather(*[ldap_search(ldap_connection) for _ in range(10)])
+    assert max_in_flight == 2
+
+
 def test_configure_ldap_connection_timeout(
     load_settings_overrides: dict[str, str],
 ) -> None:
@@ -308,10 +353,71 @@ async def test_ldap_healthcheck_exception(ldap_connection: MagicMock) -> None:
     assert check is False
 
 
+async def test_ldap_healthcheck_cached(ldap_connection: MagicMock) -> None:
+    ldap_connection.get_response.return_value = (
+        [{}],
+        {
+            "type": "searchResDone",
+            "description": "success",
+        },
+    )
+    ldap_connection.bound = True
+    ldap_connection.listening = True
+    ldap_connection.closed = False
+    ldap_connection_states[ldap_connection] = LDAPConnectionState(1, 60)
+
+    context = {"user_context": {"ldap_connection": ldap_connection}}
+
+    assert await ldap_healthcheck(context) is True
+    assert await ldap_healthcheck(context) is True
+    ldap_connection.search.assert_called_once()
+
+    # Connection state is still checked on every call
+    ldap_connection.closed = True
+    assert await ldap_healthcheck(context) is False
+    ldap_connection.search.assert_called_once()
+
+
+async def test_ldap_healthcheck_cache_expiry(
+    ldap_connection: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = 0.0
+    monkeypatch.setattr("mo_ldap_import_export.ldap.monotonic", lambda: now)
+
+    ldap_connection.get_response.return_value = (
+        [{}],
+        {"type": "searchResDone", "description": "operationsError"},
+    )
+    ldap_connection.bound = True
+    ldap_connection.listening = True
+    ldap_connection.closed = False
+    ldap_connection_states[ldap_connection] = LDAPConnectionState(1, 5)
+
+    context = {"user_context": {"ldap_connection": ldap_connection}}
+
+    # Failed searches are not trusted
+    assert await ldap_healthcheck(context) is False
+    ldap_connection.get_response.return_value = (
+        [{}],
+        {"type": "searchResDone", "description": "success"},
+    )
+    assert await ldap_healthcheck(context) is True
+    assert ldap_connection.search.call_count == 2
+
+    # Successful searches are trusted until the TTL has passed
+    now = 4.0
+    assert await ldap_healthcheck(context) is True
+    assert ldap_connection.search.call_count == 2
+    now = 5.0
+    assert await ldap_healthcheck(context) is True
+    assert ldap_connection.search.call_count == 3
+
+
 async def test_is_dn():
     assert is_dn("CN=Harry Styles,OU=Band,DC=Stage") is True
     assert is_dn("foo") is False
     assert is_dn("cn@foo.dk") is False  # This passes the 'safe_dn' test
+    assert is_dn("foo=") is False  # This passes the equals sign pre-check
 
 
 async def test_make_generic_ldap_object(cpr_field: str, context: Context):
@@ -548,6 +654,23 @@ async def test_single_object_search(ldap_connection: MagicMock, context: Context
     assert output == search_entry
 
 
+async def test_object_search_multiple_search_bases(
+    ldap_connection: MagicMock,
+) -> None:
+    search_entry = {"type": "searchResEntry", "dn": "CN=foo,DC=bar"}
+    ldap_connection.get_response.return_value = [search_entry], {"type": "test"}
+
+    search_bases = ["OU=foo,DC=bar", "OU=baz,DC=bar"]
+    output = await object_search(
+        {"search_base": search_bases, "search_filter": "(cn=foo)"}, ldap_connection
+    )
+    assert output == [search_entry, search_entry]
+    # Each search base is searched on its own
+    assert [
+        call.kwargs["search_base"] for call in ldap_connection.search.call_args_list
+    ] == search_bases
+
+
 async def test_setup_poller() -> None:
     async def _poller(*args: Any) -> None:
         raise ValueError("BOOM")
@@ -664,11 +787,29 @@ async def test_poller_bad_result(
     assert ldap_amqpsystem.call_count == 0
 
 
-def test_is_uuid():
-    assert is_uuid(str(uuid4())) is True
-    assert is_uuid("not_an_uuid") is False
-    assert is_uuid(None) is False
-    assert is_uuid(uuid4()) is True
+def test_filter_ldap_object() -> None:
+    nested = LdapObject(dn="CN=bar", name="bar")
+    ldap_object = LdapObject(dn="CN=foo", name="foo", manager=nested, mail=[])
+    assert filter_ldap_object(ldap_object, ["NAME", "manager"]) == LdapObject(
+        dn="CN=foo", name="foo", manager=nested
+    )
+    assert filter_ldap_object(ldap_object, []) == LdapObject(dn="CN=foo")
+
+
+def test_filter_ldap_object_aliased_attribute() -> None:
+    definitions = {"attributeTypes": ["( 2.5.4.4 NAME ( 'sn' 'surname' ) SUP name )"]}
+    schema = SchemaInfo("cn=schema", definitions, definitions)
+    ldap_object = LdapObject(
+        dn="CN=foo", sn="Hansen", mail="foo@example.com", **{"cert;binary": "bar"}
+    )
+    # The server returns the attribute by another name than the one requested
+    assert filter_ldap_object(ldap_object, ["surname"], schema) == LdapObject(
+        dn="CN=foo", sn="Hansen"
+    )
+    # Options added by the server are ignored when matching
+    assert filter_ldap_object(ldap_object, ["cert"]) == LdapObject(
+        dn="CN=foo", **{"cert;binary": "bar"}
+    )
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from structlog.testing import capture_logs
+
+from mo_ldap_import_export.config import Settings
+from mo_ldap_import_export.ldap_amqp import handle_uuid
+from mo_ldap_import_export.ldap_amqp import http_process_uuid
+from mo_ldap_import_export.ldap_classes import LdapObject
+from mo_ldap_import_export.ldapapi import LDAPAPI
+
+
+@pytest.mark.usefixtures("minimal_valid_environmental_variables")
+async def test_handle_uuid_caches_non_employee(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("LDAP_NON_EMPLOYEE_CACHE_TTL", "3600")
+    settings = Settings()
+    ldapapi = LDAPAPI(settings, MagicMock())
+    ldapapi.get_ldap_dn = AsyncMock(return_value="CN=foo,DC=bar")  # type: ignore
+    dataloader = MagicMock()
+    dataloader.ldapapi = ldapapi
+    converter = MagicMock()
+    converter.settings = settings
+    sync_tool = AsyncMock()
+
+    uuid = uuid4()
+    ldap_object = LdapObject(dn="CN=foo,DC=bar", objectClass=["group"])
+    get_ldap_object = AsyncMock(return_value=ldap_object)
+    with (
+        patch("mo_ldap_import_export.ldap_amqp.get_ldap_object", get_ldap_object),
+        capture_logs() as cap_logs,
+    ):
+        await handle_uuid(settings, sync_tool, dataloader, converter, uuid)
+        await handle_uuid(settings, sync_tool, dataloader, converter, uuid)
+
+    events = [m["event"] for m in cap_logs if m["log_level"] != "debug"]
+    assert events == [
+        "Received LDAP AMQP event",
+        "Ignoring change: not Employee objectClass",
+        "Received LDAP AMQP event",
+        "Ignoring change: cached as not Employee objectClass",
+    ]
+    ldapapi.get_ldap_dn.assert_awaited_once_with(uuid)
+    get_ldap_object.assert_awaited_once()
+    sync_tool.import_single_user.assert_not_awaited()
+
+
+@pytest.mark.usefixtures("minimal_valid_environmental_variables")
+async def test_handle_uuid_object_class_case_insensitive() -> None:
+    settings = Settings()
+    ldapapi = LDAPAPI(settings, MagicMock())
+    ldapapi.get_ldap_dn = AsyncMock(return_value="CN=foo,DC=bar")  # type: ignore
+    dataloader = MagicMock()
+    dataloader.ldapapi = ldapapi
+    converter = MagicMock()
+    converter.settings = settings
+    sync_tool = AsyncMock()
+
+    object_class = settings.ldap_object_class.swapcase()
+    ldap_object = LdapObject(dn="CN=foo,DC=bar", objectClass=["top", object_class])
+    get_ldap_object = AsyncMock(return_value=ldap_object)
+    with patch("mo_ldap_import_export.ldap_amqp.get_ldap_object", get_ldap_object):
+        await handle_uuid(settings, sync_tool, dataloader, converter, uuid4())
+
+    sync_tool.import_single_user.assert_awaited_once_with("CN=foo,DC=bar")
+
+
+@pytest.mark.parametrize("cache_ttl", [None, "3600"])
+@pytest.mark.usefixtures("minimal_valid_environmental_variables")
+async def test_handle_uuid_object_class_change(
+    monkeypatch: pytest.MonkeyPatch, cache_ttl: str | None
+) -> None:
+    if cache_ttl is not None:
+        monkeypatch.setenv("LDAP_NON_EMPLOYEE_CACHE_TTL", cache_ttl)
+    settings = Settings()
+    ldapapi = LDAPAPI(settings, MagicMock())
+    ldapapi.get_ldap_dn = AsyncMock(return_value="CN=foo,DC=bar")  # type: ignore
+    dataloader = MagicMock()
+    dataloader.ldapapi = ldapapi
+    converter = MagicMock()
+    converter.settings = settings
+    sync_tool = AsyncMock()
+
+    uuid = uuid4()
+    group = LdapObject(dn="CN=foo,DC=bar", objectClass=["group"])
+    employee = LdapObject(dn="CN=foo,DC=bar", objectClass=[settings.ldap_object_class])
+    get_ldap_object = AsyncMock(side_effect=[group, employee])
+    with patch("mo_ldap_import_export.ldap_amqp.get_ldap_object", get_ldap_object):
+        await handle_uuid(settings, sync_tool, dataloader, converter, uuid)
+        sync_tool.import_single_user.assert_not_awaited()
+
+        # The object is changed to an employee in LDAP
+        if cache_ttl is None:
+            # Without caching, the next event picks up the change
+            await handle_uuid(settings, sync_tool, dataloader, converter, uuid)
+        else:
+            # With caching, an explicit synchronisation picks up the change
+            await http_process_uuid(settings, sync_tool, dataloader, converter, uuid)
+
+    sync_tool.import_single_user.assert_awaited_once_with("CN=foo,DC=bar")
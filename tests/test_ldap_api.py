@@ -1,13 +1,19 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
 from unittest.mock import AsyncMock
+from unittest.mock import patch
+from uuid import uuid4
 
 import pytest
+from more_itertools import one
+from structlog.testing import capture_logs
 
 from mo_ldap_import_export.config import Settings
+from mo_ldap_import_export.exceptions import MultipleObjectsReturnedException
 from mo_ldap_import_export.exceptions import NoObjectsReturnedException
 from mo_ldap_import_export.ldapapi import LDAPAPI
 from mo_ldap_import_export.types import CPRNumber
+from mo_ldap_import_export.utils import combine_dn_strings
 
 
 @pytest.mark.usefixtures("minimal_valid_environmental_variables")
@@ -22,3 +28,108 @@ async def test_cpr2dns_not_configured(monkeypatch: pytest.MonkeyPatch) -> None:
     with pytest.raises(NoObjectsReturnedException) as exc_info:
         await ldapapi.cpr2dns(CPRNumber("0101700000"))
     assert "cpr_field is not configured" in str(exc_info.value)
+
+
+@pytest.mark.usefixtures("minimal_valid_environmental_variables")
+async def test_cpr2dns() -> None:
+    settings = Settings()
+    connection = AsyncMock()
+    ldapapi = LDAPAPI(settings, connection)
+
+    search_results = [
+        {"dn": "CN=foo", "attributes": {}},
+        {"dn": "CN=bar", "attributes": {}},
+    ]
+    with patch(
+        "mo_ldap_import_export.ldapapi.object_search", return_value=search_results
+    ) as object_search:
+        dns = await ldapapi.cpr2dns(CPRNumber("0101700000"))
+    assert dns == {"CN=foo", "CN=bar"}
+    object_search.assert_awaited_once()
+    search_parameters = object_search.call_args.args[0]
+    assert search_parameters["search_base"] is ldapapi.search_bases
+    assert ldapapi.search_bases == [
+        combine_dn_strings([ou, settings.ldap_search_base])
+        for ou in settings.ldap_ous_to_search_in
+    ]
+
+
+@pytest.mark.usefixtures("minimal_valid_environmental_variables")
+@pytest.mark.envvar({"LDAP_DIALECT": "Standard"})
+async def test_convert_ldap_uuids_to_dns_bulk() -> None:
+    settings = Settings()
+    connection = AsyncMock()
+    ldapapi = LDAPAPI(settings, connection)
+
+    foo_uuid = uuid4()
+    bar_uuid = uuid4()
+    missing_uuid = uuid4()
+
+    # No UUIDs, no search
+    with patch("mo_ldap_import_export.ldapapi.object_search") as object_search:
+        assert await ldapapi.convert_ldap_uuids_to_dns(set()) == set()
+    object_search.assert_not_called()
+
+    # All UUIDs are resolved by a single search
+    search_results = [
+        {"dn": "CN=foo", "attributes": {"entryUUID": str(foo_uuid)}},
+        {"dn": "CN=bar", "attributes": {"entryUUID": [str(bar_uuid)]}},
+    ]
+    with (
+        patch(
+            "mo_ldap_import_export.ldapapi.object_search",
+            return_value=search_results,
+        ) as object_search,
+        capture_logs() as cap_logs,
+    ):
+        dns = await ldapapi.convert_ldap_uuids_to_dns(
+            {foo_uuid, bar_uuid, missing_uuid}
+        )
+    assert dns == {"CN=foo", "CN=bar"}
+    object_search.assert_awaited_once()
+    search_parameters = object_search.call_args.args[0]
+    assert search_parameters["attributes"] == ["entryUUID"]
+    for uuid in (foo_uuid, bar_uuid, missing_uuid):
+        assert f"(entryUUID={uuid})" in search_parameters["search_filter"]
+    assert [log["event"] for log in cap_logs] == [
+        "Looking for LDAP objects",
+        "Unable to convert LDAP UUIDs to DNs",
+    ]
+    assert cap_logs[1]["not_found"] == {missing_uuid}
+
+
+@pytest.mark.usefixtures("minimal_valid_environmental_variables")
+@pytest.mark.envvar({"LDAP_DIALECT": "Standard"})
+async def test_convert_ldap_uuids_to_dns_bulk_exception() -> None:
+    settings = Settings()
+    connection = AsyncMock()
+    ldapapi = LDAPAPI(settings, connection)
+
+    uuid = uuid4()
+
+    with (
+        patch(
+            "mo_ldap_import_export.ldapapi.object_search",
+            side_effect=ValueError("BOOM"),
+        ),
+        pytest.raises(ExceptionGroup) as exc_info,
+    ):
+        await ldapapi.convert_ldap_uuids_to_dns({uuid})
+    assert "Exceptions during UUID2DN translation" in str(exc_info.value)
+    assert isinstance(one(exc_info.value.exceptions), ValueError)
+
+    search_results = [
+        {"dn": "CN=foo", "attributes": {"entryUUID": str(uuid)}},
+        {"dn": "CN=bar", "attributes": {"entryUUID": str(uuid)}},
+    ]
+    with (
+        patch(
+            "mo_ldap_import_export.ldapapi.object_search",
+            return_value=search_results,
+        ),
+        pytest.raises(ExceptionGroup) as exc_info,
+    ):
+        await ldapapi.convert_ldap_uuids_to_dns({uuid})
+    assert "Exceptions during UUID2DN translation" in str(exc_info.value)
+    exception = one(exc_info.value.exceptions)
+    assert isinstance(exception, MultipleObjectsReturnedException)
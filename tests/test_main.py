@@ -33,6 +33,7 @@ from mo_ldap_import_export.exceptions import IgnoreChanges
 from mo_ldap_import_export.exceptions import IncorrectMapping
 from mo_ldap_import_export.exceptions import NoObjectsReturnedException
 from mo_ldap_import_export.exceptions import ReadOnlyException
+from mo_ldap_import_export.ldap import ldap_connection_states
 from mo_ldap_import_export.ldap_classes import LdapObject
 from mo_ldap_import_export.main import amqp_reject_on_failure
 from mo_ldap_import_export.main import create_app
@@ -46,6 +47,7 @@ from mo_ldap_import_export.main import process_person
 from mo_ldap_import_export.models import Address
 from mo_ldap_import_export.models import Employee
 from mo_ldap_import_export.models import ITUser
+from mo_ldap_import_export.models import Validity
 from mo_ldap_import_export.usernames import UserNameGenerator
 from mo_ldap_import_export.usernames import get_username_generator_class
 from mo_ldap_import_export.utils import get_delete_flag
@@ -314,11 +316,16 @@ async def test_open_ldap_connection() -> None:
         state.append(2)
 
     ldap_connection = manager()
+    connection_state = MagicMock()
+    ldap_connection_states[ldap_connection] = connection_state  # type: ignore
 
     assert not state
     async with open_ldap_connection(ldap_connection):  # type: ignore
         assert state == [1]
     assert state == [1, 2]
+    # The connection state is shut down alongside the connection
+    connection_state.close.assert_called_once_with()
+    assert ldap_connection not in ldap_connection_states
 
 
 async def test_listen_to_ituser(graphql_mock: GraphQLMocker) -> None:
@@ -331,14 +338,24 @@ async def test_listen_to_ituser(graphql_mock: GraphQLMocker) -> None:
 
     employee_route = graphql_mock.query("read_ituser_employee_uuid")
     employee_route.result = {
-        "itusers": {"objects": [{"current": {"employee_uuid": employee_uuid}}]}
+        "itusers": {
+            "objects": [
+                {
+                    "current": {"employee_uuid": employee_uuid},
+                    "validities": [{"user_key": "foo"}, {"user_key": "foo"}],
+                }
+            ]
+        }
     }
 
     employee_refresh_route = graphql_mock.query("employee_refresh")
     employee_refresh_route.result = {"employee_refresh": {"objects": [employee_uuid]}}
 
-    await process_ituser(employee_uuid, graphql_client, amqpsystem)
+    dataloader = MagicMock()
+    await process_ituser(employee_uuid, graphql_client, amqpsystem, dataloader)
     assert employee_refresh_route.called
+    dataloader.moapi.evict_ituser_lookup.assert_called_once_with("foo")
+    dataloader.moapi.evict_employee_lookups.assert_called_once_with(employee_uuid)
 
 
 @pytest.mark.parametrize(
@@ -346,11 +363,20 @@ async def test_listen_to_ituser(graphql_mock: GraphQLMocker) -> None:
     [
         # Must return exactly one result
         ([], "Unable to lookup ITUser"),
-        ([{"current": None}, {"current": None}], "Unable to lookup ITUser"),
+        (
+            [
+                {"current": None, "validities": []},
+                {"current": None, "validities": []},
+            ],
+            "Unable to lookup ITUser",
+        ),
         # Must have current result
-        ([{"current": None}], "ITUser not currently active"),
+        ([{"current": None, "validities": []}], "ITUser not currently active"),
         # Must have an UUID set in employee_uuid
-        ([{"current": {"employee_uuid": None}}], "ITUser not attached to a person"),
+        (
+            [{"current": {"employee_uuid": None}, "validities": []}],
+            "ITUser not attached to a person",
+        ),
     ],
 )
 async def test_listen_to_ituser_failure(
@@ -368,10 +394,52 @@ async def test_listen_to_ituser_failure(
 
     employee_uuid = uuid4()
     with pytest.raises(RejectMessage) as exc_info:
-        await process_ituser(employee_uuid, graphql_client, amqpsystem)
+        await process_ituser(employee_uuid, graphql_client, amqpsystem, MagicMock())
     assert error in str(exc_info.value)
 
 
+@pytest.mark.parametrize(
+    "current,error",
+    [
+        # Terminated
+        (None, "ITUser not currently active"),
+        # Detached from its person
+        ({"employee_uuid": None}, "ITUser not attached to a person"),
+    ],
+)
+async def test_listen_to_ituser_evicts_before_reject(
+    graphql_mock: GraphQLMocker,
+    current: dict[str, Any] | None,
+    error: str,
+) -> None:
+    amqpsystem = create_autospec(AMQPSystem)
+    amqpsystem.exchange_name = "wow"
+
+    graphql_client = GraphQLClient("http://example.com/graphql")
+
+    employee_route = graphql_mock.query("read_ituser_employee_uuid")
+    employee_route.result = {
+        "itusers": {
+            "objects": [
+                {
+                    "current": current,
+                    "validities": [{"user_key": "foo"}, {"user_key": "bar"}],
+                }
+            ]
+        }
+    }
+
+    dataloader = MagicMock()
+    with pytest.raises(RejectMessage) as exc_info:
+        await process_ituser(uuid4(), graphql_client, amqpsystem, dataloader)
+    assert error in str(exc_info.value)
+    evicted = {
+        call.args[0] for call in dataloader.moapi.evict_ituser_lookup.call_args_list
+    }
+    assert evicted == {"foo", "bar"}
+    dataloader.moapi.evict_employee_lookups.assert_not_called()
+
+
 async def test_listen_to_engagement(graphql_mock: GraphQLMocker) -> None:
     amqpsystem = create_autospec(AMQPSystem)
     amqpsystem.exchange_name = "wow"
@@ -580,18 +648,24 @@ async def test_reject_on_failure(
 
 
 async def test_get_delete_flag(dataloader: AsyncMock):
-    # When there are matching objects in MO, but the to-date is today, delete
-    mo_object = {"validity": {"to": mo_today().isoformat()}}
+    def make_ituser(to: datetime.datetime | None) -> ITUser:
+        return ITUser(
+            user_key="foo",
+            itsystem=uuid4(),
+            person=uuid4(),
+            validity=Validity(start=mo_today() - datetime.timedelta(days=1), end=to),
+        )
 
-    flag = get_delete_flag(mo_object)
+    # When there are matching objects in MO, but the to-date is today, delete
+    flag = get_delete_flag(make_ituser(mo_today()))
     assert flag is True
 
     # When there are matching objects in MO, but the to-date is tomorrow, do not delete
-    mo_object = {
-        "validity": {"to": (mo_today() + datetime.timedelta(days=1)).isoformat()}
-    }
+    flag = get_delete_flag(make_ituser(mo_today() + datetime.timedelta(days=1)))
+    assert flag is False
 
-    flag = get_delete_flag(mo_object)
+    # When there are matching objects in MO without a to-date, do not delete
+    flag = get_delete_flag(make_ituser(None))
     assert flag is False
 
 
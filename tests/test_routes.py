@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
+# SPDX-License-Identifier: MPL-2.0
+import pytest
+
+from mo_ldap_import_export.exceptions import InvalidCPR
+from mo_ldap_import_export.routes import valid_cpr
+
+
+@pytest.mark.parametrize(
+    "cpr,expected",
+    [
+        ("0101011234", "0101011234"),
+        ("010101-1234", "0101011234"),
+    ],
+)
+async def test_valid_cpr(cpr: str, expected: str) -> None:
+    assert await valid_cpr(cpr) == expected
+
+
+@pytest.mark.parametrize(
+    "cpr",
+    [
+        "",
+        "010101123",
+        "01010112345",
+        "010101123a",
+        # Only ASCII digits are accepted, and no trailing newline
+        "0101011234\n",
+        "０１０１０１１２３４",
+        "٠١٠١٠١١٢٣٤",
+    ],
+)
+async def test_valid_cpr_invalid(cpr: str) -> None:
+    with pytest.raises(InvalidCPR):
+        await valid_cpr(cpr)
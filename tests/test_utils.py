@@ -1,16 +1,17 @@
 # SPDX-FileCopyrightText: Magenta ApS <https://magenta.dk>
 # SPDX-License-Identifier: MPL-2.0
 # -*- coding: utf-8 -*-
-import datetime
 
 import pytest
 from ldap3.core.exceptions import LDAPInvalidDnError
 
+from mo_ldap_import_export.utils import IndexedTTLCache
+from mo_ldap_import_export.utils import TTLCache
 from mo_ldap_import_export.utils import combine_dn_strings
 from mo_ldap_import_export.utils import delete_keys_from_dict
 from mo_ldap_import_export.utils import extract_ou_from_dn
+from mo_ldap_import_export.utils import extract_part_from_dn
 from mo_ldap_import_export.utils import import_class
-from mo_ldap_import_export.utils import mo_datestring_to_utc
 from mo_ldap_import_export.utils import remove_vowels
 
 
@@ -41,23 +42,6 @@ async def test_delete_keys_from_dict() -> None:
     assert "foo" not in modified_dict["nest"]
 
 
-async def test_mo_datestring_to_utc() -> None:
-    date = mo_datestring_to_utc("2023-02-27T00:00:00+01:00")
-    assert date is not None
-    assert date.date() == datetime.date(2023, 2, 27)
-
-    date = mo_datestring_to_utc("2023-02-27T00:00:00-03:00")
-    assert date is not None
-    assert date.date() == datetime.date(2023, 2, 27)
-
-    date = mo_datestring_to_utc("2023-02-27T01:02:03-03:00")
-    assert date is not None
-    assert date == datetime.datetime(2023, 2, 27, 1, 2, 3)
-
-    date = mo_datestring_to_utc(None)
-    assert date is None
-
-
 def test_combine_dn_strings() -> None:
     assert combine_dn_strings(["CN=Nick", "", "DC=bar"]) == "CN=Nick,DC=bar"
     assert combine_dn_strings(["CN=Nick", "OU=f", "DC=bar"]) == "CN=Nick,OU=f,DC=bar"
@@ -78,3 +62,62 @@ def test_extract_ou_from_dn() -> None:
 
     with pytest.raises(LDAPInvalidDnError):
         extract_ou_from_dn("")
+
+    # Repeated lookups are served from the cache
+    hits = extract_part_from_dn.cache_info().hits
+    assert extract_ou_from_dn("CN=Nick,OU=org,DC=f") == "OU=org"
+    assert extract_part_from_dn.cache_info().hits == hits + 1
+
+
+def test_ttl_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+    monkeypatch.setattr("mo_ldap_import_export.utils.monotonic", lambda: now)
+
+    cache: TTLCache[str, int] = TTLCache(ttl=10, maxsize=2)
+    assert cache.get("a") is None
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    assert cache.get("b") == 2
+
+    # Inserting beyond maxsize evicts the oldest entry
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+
+    cache.pop("b")
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    # Entries expire after the ttl
+    now = 10.0
+    assert cache.get("c") is None
+    assert len(cache) == 0
+
+
+def test_indexed_ttl_cache() -> None:
+    cache: IndexedTTLCache[str, int] = IndexedTTLCache(ttl=10, maxsize=2)
+    cache.set("a", frozenset({1, 2}))
+    cache.set("b", frozenset({2, 3}))
+
+    cache.evict_member(1)
+    assert cache.get("a") is None
+    assert cache.get("b") == frozenset({2, 3})
+
+    # Replacing an entry drops the members of the old value from the index
+    cache.set("b", frozenset({4}))
+    cache.evict_member(3)
+    assert cache.get("b") == frozenset({4})
+
+    # Entries evicted due to maxsize leave no members behind in the index
+    cache.set("c", frozenset({5}))
+    cache.set("d", frozenset({6}))
+    assert cache.get("b") is None
+    assert cache._index == {5: {"c"}, 6: {"d"}}
+
+
+def test_ttl_cache_disabled() -> None:
+    cache: TTLCache[str, int] = TTLCache(ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None